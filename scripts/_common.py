@@ -0,0 +1,213 @@
+"""
+Shared helpers for the cron scripts in this directory.
+
+Every script used to carry its own copy of the logging setup, the file lock
+and the SQLite connection boilerplate. They live here now so a fix in one
+place applies to all of them.
+"""
+
+import atexit
+import fcntl
+import logging
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+# Background thread that drains queued records into the log file
+_log_listener: Optional[QueueListener] = None
+
+
+def setup_logging(log_dir: Path, prefix: str) -> logging.Logger:
+    """
+    Setup logging to both file and console.
+
+    Args:
+        log_dir: Directory for log files
+        prefix: Log file prefix, e.g. "balances" -> balances_YYYYMM.log
+
+    Returns:
+        Configured root logger
+    """
+    global _log_listener
+
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    # Simple formatter without logger name to avoid duplication
+    formatter = logging.Formatter(
+        "%(asctime)s - %(levelname)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Get root logger
+    logger = logging.getLogger()
+    logger.setLevel(logging.INFO)
+
+    # Clear existing handlers to prevent duplication
+    logger.handlers.clear()
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+
+    # File handler with monthly rotation. Records go through a queue so the
+    # file writes happen on the listener thread, off the ingestion path
+    log_file = log_dir / f"{prefix}_{datetime.now().strftime('%Y%m')}.log"
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    _log_listener = QueueListener(log_queue, file_handler)
+    _log_listener.start()
+
+    # Console handler stays direct so progress shows up immediately
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+    logger.addHandler(console_handler)
+
+    return logger
+
+
+@atexit.register
+def _stop_log_listener():
+    """Flush queued records to the log file before the interpreter exits."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+class LockFile:
+    """Context manager for file-based locking to prevent concurrent runs."""
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self.lock_file = None
+
+    def __enter__(self):
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_file = open(self.lock_path, "w")
+        try:
+            # Non-blocking lock
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.lock_file.write(f"{os.getpid()}\n{datetime.now().isoformat()}\n")
+            self.lock_file.flush()
+            return self
+        except IOError:
+            self.lock_file.close()
+            raise RuntimeError(f"Another instance is already running (lock file: {self.lock_path})")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.lock_file:
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+            self.lock_file.close()
+            # Clean up lock file
+            try:
+                self.lock_path.unlink()
+            except:
+                pass
+
+
+# Seconds a connection waits on a locked database before raising
+BUSY_TIMEOUT = 30
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite connection with WAL and tuned PRAGMAs applied.
+
+    Every script that writes to the database should connect through here.
+    """
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT)
+    conn.executescript(
+        """
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -64000;
+        PRAGMA mmap_size = 268435456;
+        PRAGMA foreign_keys = ON;
+    """
+    )
+    return conn
+
+
+def connect_ro(db_path: str) -> sqlite3.Connection:
+    """
+    Open a read-only SQLite connection for validation and reporting queries.
+
+    The file is opened with mode=ro, so it is never created by accident and
+    these connections can't take the write lock away from a running
+    ingestion job.
+    """
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=BUSY_TIMEOUT)
+    conn.executescript(
+        """
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -64000;
+        PRAGMA mmap_size = 268435456;
+    """
+    )
+    return conn
+
+
+# One writer per database, kept open for the whole run so the PRAGMAs are
+# applied once and the page cache stays warm between phases
+_connections: Dict[str, sqlite3.Connection] = {}
+
+
+def get_writer(db_path: str) -> sqlite3.Connection:
+    """Return the run's shared read-write connection to db_path."""
+    key = os.path.abspath(db_path)
+    if key not in _connections:
+        _connections[key] = connect(db_path)
+    return _connections[key]
+
+
+@atexit.register
+def close_connections():
+    """Close every connection handed out by get_writer()."""
+    while _connections:
+        _, conn = _connections.popitem()
+        conn.close()
+
+
+@contextmanager
+def read_tx(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run the block against one consistent snapshot (BEGIN DEFERRED).
+
+    The transaction is always ended on exit so the snapshot isn't held open.
+    """
+    conn.execute("BEGIN DEFERRED")
+    try:
+        yield conn
+    finally:
+        conn.commit()
+
+
+@contextmanager
+def write_tx(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run the block under the write lock (BEGIN IMMEDIATE).
+
+    Commits on success and rolls back if the block raises. Raises
+    RuntimeError if another writer still holds the lock after BUSY_TIMEOUT.
+    """
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+    except sqlite3.OperationalError as e:
+        if "locked" not in str(e):
+            raise
+        raise RuntimeError(f"Another writer holds the database lock ({e})") from e
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
@@ -10,7 +10,7 @@ import sqlite3
 from dotenv import load_dotenv
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-from portfolio.blockchain import EVMAdapter
+from portfolio.blockchain import EVMAdapter, TokenMetadataCache
 
 load_dotenv()
 
@@ -52,7 +52,8 @@ def main():
         adapter = EVMAdapter(
             rpc_url=network_info['rpc_endpoint'],
             network=network,
-            chain_id=network_info['chain_id']
+            chain_id=network_info['chain_id'],
+            metadata_cache=TokenMetadataCache(),
         )
 
         metadata = adapter.get_token_metadata(contract_address)
@@ -34,7 +34,7 @@ from dotenv import load_dotenv
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from portfolio.blockchain import EVMAdapter
+from portfolio.blockchain import EVMAdapter, TokenMetadataCache
 
 # Load environment
 load_dotenv()
@@ -201,6 +201,9 @@ def discover_wallet_tokens(db_path: str):
 
     logger.info(f"Existing contracts: {len(existing_contracts)}")
 
+    # Metadata is immutable per contract; reuse what earlier runs fetched
+    metadata_cache = TokenMetadataCache()
+
     # Discover tokens
     total_discovered = 0
 
@@ -222,6 +225,7 @@ def discover_wallet_tokens(db_path: str):
                     rpc_url=networks[network]["rpc_endpoint"],
                     network=network,
                     chain_id=networks[network]["chain_id"],
+                    metadata_cache=metadata_cache,
                 )
 
                 # Get all known ERC-20 contracts for this network
@@ -237,46 +241,46 @@ def discover_wallet_tokens(db_path: str):
                 known_contracts = [row[0] for row in cursor.fetchall()]
                 logger.info(f"  Checking {len(known_contracts)} known contracts...")
 
-                # Scan for balances
+                # Balances and decimals for every contract in one round trip
+                # where Multicall3 is deployed; metadata only for what's held
                 found = 0
-                for contract_address in known_contracts:
+                token_balances = adapter.discover_erc20_tokens(
+                    address, dict.fromkeys(known_contracts)
+                )
+                for token in token_balances:
+                    contract_address = token.contract_address
                     try:
-                        balance_raw = adapter.get_erc20_balance(contract_address, address)
-
-                        if balance_raw > 0:
-                            # Get metadata
-                            metadata = adapter.get_token_metadata(contract_address)
-
-                            if metadata:
-                                # Check if this is a new discovery
-                                if (network, contract_address.lower()) not in existing_contracts:
-                                    logger.info(
-                                        f"  ✓ Found NEW token: {metadata.symbol} (balance: {balance_raw / (10**metadata.decimals):.6f})"
-                                    )
-
-                                    # Create currency if needed
-                                    currency_id = get_or_create_currency(
-                                        conn, metadata.symbol, metadata.name
-                                    )
-
-                                    # Add contract
-                                    added = add_blockchain_contract(
-                                        conn,
-                                        currency_id,
-                                        network,
-                                        contract_address,
-                                        metadata.decimals,
-                                        metadata.name,
-                                    )
-
-                                    if added:
-                                        existing_contracts.add((network, contract_address.lower()))
-                                        total_discovered += 1
-                                        found += 1
-                                else:
-                                    logger.debug(
-                                        f"  - {metadata.symbol} (already in database)"
-                                    )
+                        # Check if this is a new discovery
+                        if (network, contract_address) in existing_contracts:
+                            logger.debug(f"  - {contract_address[:10]}... (already in database)")
+                            continue
+
+                        metadata = adapter.get_token_metadata(contract_address)
+                        if not metadata:
+                            continue
+
+                        logger.info(
+                            f"  ✓ Found NEW token: {metadata.symbol}"
+                            f" (balance: {token.balance:.6f})"
+                        )
+
+                        # Create currency if needed
+                        currency_id = get_or_create_currency(conn, metadata.symbol, metadata.name)
+
+                        # Add contract
+                        added = add_blockchain_contract(
+                            conn,
+                            currency_id,
+                            network,
+                            contract_address,
+                            metadata.decimals,
+                            metadata.name,
+                        )
+
+                        if added:
+                            existing_contracts.add((network, contract_address))
+                            total_discovered += 1
+                            found += 1
 
                     except Exception as e:
                         logger.debug(f"  Error checking {contract_address}: {e}")
@@ -305,6 +309,7 @@ def discover_wallet_tokens(db_path: str):
         logger.info("\nAll tokens already in database. You can now:")
         logger.info("1. Fetch balances: python scripts/ingest_balances.py --sources wallets")
 
+    metadata_cache.close()
     conn.close()
 
 
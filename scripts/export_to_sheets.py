@@ -32,7 +32,6 @@ Example Cron (every 6 hours, 5min after ingestion):
 """
 
 import argparse
-import fcntl
 import logging
 import os
 import sqlite3
@@ -46,6 +45,8 @@ from google.oauth2.service_account import Credentials as ServiceAccountCredentia
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from _common import LockFile, connect_ro, setup_logging
+
 
 # Column type hints for formatting
 VIEW_COLUMN_TYPES = {
@@ -57,70 +58,6 @@ VIEW_COLUMN_TYPES = {
 }
 
 
-def setup_logging(log_dir: Path) -> logging.Logger:
-    """Setup logging to both file and console."""
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    # Simple formatter without logger name to avoid duplication
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # Get root logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-
-    # Clear existing handlers to prevent duplication
-    logger.handlers.clear()
-
-    # File handler with monthly rotation
-    log_file = log_dir / f"export_{datetime.now().strftime('%Y%m')}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    return logger
-
-
-class LockFile:
-    """Context manager for file-based locking."""
-
-    def __init__(self, lock_path: Path):
-        self.lock_path = lock_path
-        self.lock_file = None
-
-    def __enter__(self):
-        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-        self.lock_file = open(self.lock_path, "w")
-        try:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_file.write(f"{os.getpid()}\n{datetime.now().isoformat()}\n")
-            self.lock_file.flush()
-            return self
-        except IOError:
-            self.lock_file.close()
-            raise RuntimeError(
-                f"Another instance is already running (lock file: {self.lock_path})"
-            )
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.lock_file:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
-            self.lock_file.close()
-            try:
-                self.lock_path.unlink()
-            except:
-                pass
-
-
 def validate_database(db_path: Path) -> bool:
     """
     Validate database exists and has required views.
@@ -133,7 +70,7 @@ def validate_database(db_path: Path) -> bool:
         return False
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect_ro(db_path)
         cursor = conn.execute(
             """
             SELECT name FROM sqlite_master
@@ -145,7 +82,7 @@ def validate_database(db_path: Path) -> bool:
             )
         """
         )
-        views = {row[0] for row in cursor.fetchall()}
+        views = {row[0] for row in cursor}
         conn.close()
 
         required_views = {
@@ -174,7 +111,7 @@ def validate_data_exists(db_path: str) -> bool:
         True if data exists, False if empty
     """
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect_ro(db_path)
         cursor = conn.execute("SELECT COUNT(*) FROM balances")
         count = cursor.fetchone()[0]
         conn.close()
@@ -202,7 +139,7 @@ def query_view_data(db_path: str, view_name: str) -> Tuple[List[str], List[tuple
     Returns:
         Tuple of (column_names, rows)
     """
-    conn = sqlite3.connect(db_path)
+    conn = connect_ro(db_path)
 
     # Special handling for net_worth_history table
     if view_name == "net_worth_history":
@@ -300,7 +237,11 @@ def create_sheets_service(credentials_path: str):
         credentials_path, scopes=scopes
     )
 
-    service = build("sheets", "v4", credentials=creds)
+    # Use the discovery document bundled with google-api-python-client instead of
+    # downloading it on every run
+    service = build(
+        "sheets", "v4", credentials=creds, static_discovery=True, cache_discovery=False
+    )
 
     logging.info("✓ Authenticated with Google Sheets API")
     return service
@@ -650,7 +591,7 @@ def main():
     lock_file = project_root / "data" / ".export.lock"
 
     # Setup logging
-    logger = setup_logging(log_dir)
+    logger = setup_logging(log_dir, "export")
 
     logger.info("=" * 70)
     logger.info("Google Sheets Export - Starting")
@@ -24,94 +24,43 @@ Example cron (every 6 hours, all sources):
 """
 
 import argparse
-import fcntl
+import hashlib
+import json
 import logging
+import math
 import os
+import re
 import sqlite3
 import sys
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from portfolio.blockchain import MultiChainAdapter
-from portfolio.exchanges import create_exchange
+from _common import LockFile, get_writer, read_tx, setup_logging, write_tx
 
 # Load environment
 load_dotenv()
 
+# Thousands separators and whitespace stripped from text amounts in the sheet
+_NUM_CLEAN = re.compile(r"[,\s]")
 
-def setup_logging(log_dir: Path):
-    """Setup logging to both file and console."""
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    # Simple formatter without logger name to avoid duplication
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # Get root logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-
-    # Clear existing handlers to prevent duplication
-    logger.handlers.clear()
-
-    # File handler
-    log_file = log_dir / f"balances_{datetime.now().strftime('%Y%m')}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # Prevent propagation from imported module loggers
-    for module in ["portfolio.blockchain", "portfolio.exchanges", "portfolio.tradingview"]:
-        module_logger = logging.getLogger(module)
-        module_logger.propagate = (
-            True  # Let it propagate to root, but root only has one set of handlers
-        )
-
-    return logger
-
-
-class LockFile:
-    """Context manager for file-based locking."""
-
-    def __init__(self, lock_path: Path):
-        self.lock_path = lock_path
-        self.lock_file = None
-
-    def __enter__(self):
-        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-        self.lock_file = open(self.lock_path, "w")
-        try:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_file.write(f"{os.getpid()}\n{datetime.now().isoformat()}\n")
-            self.lock_file.flush()
-            return self
-        except IOError:
-            self.lock_file.close()
-            raise RuntimeError(f"Another instance is already running (lock file: {self.lock_path})")
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.lock_file:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
-            self.lock_file.close()
-            try:
-                self.lock_path.unlink()
-            except:
-                pass
+# Prepared once and reused for every row of the snapshot
+_INSERT_BALANCE_SQL = """
+    INSERT INTO balances (
+        timestamp, account_id, currency_id,
+        quantity, value_idr, value_usd
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
 
 
 # ============================================================================
@@ -119,9 +68,9 @@ class LockFile:
 # ============================================================================
 
 
-def fetch_exchange_balances(db_path: str) -> List[Dict]:
+def fetch_exchange_balances(conn: sqlite3.Connection) -> List[Dict]:
     """Fetch balances from crypto exchanges (Binance, OKX, Bitget)."""
-    from portfolio.exchanges import Balance
+    from portfolio.exchanges import create_exchange
 
     # Get exchange configs
     exchange_configs = {}
@@ -158,12 +107,7 @@ def fetch_exchange_balances(db_path: str) -> List[Dict]:
         return []
 
     # Get account mappings
-    conn = sqlite3.connect(db_path)
-    accounts = {
-        row[0]: row[1]
-        for row in conn.execute("SELECT name, id FROM accounts WHERE is_active = 1").fetchall()
-    }
-    conn.close()
+    accounts = dict(conn.execute("SELECT name, id FROM accounts WHERE is_active = 1"))
 
     # Fetch balances
     all_balances = []
@@ -211,13 +155,13 @@ def fetch_exchange_balances(db_path: str) -> List[Dict]:
 # ============================================================================
 
 
-def fetch_wallet_balances(db_path: str) -> List[Dict]:
-    """Fetch balances from on-chain wallets (EVM)."""
-
-    # Get network configurations
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+def get_network_configs(conn: sqlite3.Connection) -> Dict[str, Dict]:
+    """
+    Load RPC settings for active EVM networks.
 
+    Returns:
+        Dict of network -> {rpc_url, chain_id}
+    """
     network_configs = {}
     for row in conn.execute(
         """
@@ -226,17 +170,21 @@ def fetch_wallet_balances(db_path: str) -> List[Dict]:
         WHERE is_active = 1 AND is_evm = 1 AND rpc_endpoint IS NOT NULL
     """
     ):
-        network_configs[row["code"]] = {
-            "rpc_url": row["rpc_endpoint"],
-            "chain_id": row["chain_id"],
+        code, chain_id, rpc_endpoint = row
+        network_configs[code] = {
+            "rpc_url": rpc_endpoint,
+            "chain_id": chain_id,
         }
+    return network_configs
 
-    if not network_configs:
-        logging.warning("No network RPC endpoints configured, skipping wallets")
-        conn.close()
-        return []
 
-    # Get wallet addresses
+def get_wallet_addresses(conn: sqlite3.Connection) -> Dict[int, Dict]:
+    """
+    Load active wallet addresses grouped by account.
+
+    Returns:
+        Dict of account_id -> {account_name, addresses: {network: address}}
+    """
     wallet_accounts = {}
     for row in conn.execute(
         """
@@ -245,17 +193,85 @@ def fetch_wallet_balances(db_path: str) -> List[Dict]:
         ORDER BY account_id, network
     """
     ):
-        account_id = row["account_id"]
+        account_id, network, address, account_name = row
         if account_id not in wallet_accounts:
-            wallet_accounts[account_id] = {"account_name": row["account_name"], "addresses": {}}
-        wallet_accounts[account_id]["addresses"][row["network"]] = row["address"]
+            wallet_accounts[account_id] = {"account_name": account_name, "addresses": {}}
+        wallet_accounts[account_id]["addresses"][network] = address
+    return wallet_accounts
 
-    if not wallet_accounts:
-        logging.warning("No wallet addresses configured, skipping wallets")
-        conn.close()
-        return []
 
-    # Get contract mappings
+class _ContractDecimals(Mapping):
+    """Read-only contract_address -> decimals view over (currency_id, decimals) mappings."""
+
+    def __init__(self, contracts: Dict[str, Tuple[int, int]]):
+        self._contracts = contracts
+
+    def __getitem__(self, contract_address: str) -> int:
+        return self._contracts[contract_address][1]
+
+    def __iter__(self):
+        return iter(self._contracts)
+
+    def __len__(self) -> int:
+        return len(self._contracts)
+
+
+def _contract_mappings_cache_path(conn: sqlite3.Connection) -> Optional[Path]:
+    """
+    Locate the JSON cache file for the current contract mappings.
+
+    The file name carries a hash of the blockchain_contracts row count, highest
+    id and latest updated_at, plus the (tiny) networks table, so any insert,
+    delete or edit of the mappings points at a new file.
+
+    Returns:
+        Cache path next to the database, or None for an in-memory database
+    """
+    db_file = next((row[2] for row in conn.execute("PRAGMA database_list") if row[1] == "main"), "")
+    if not db_file:
+        return None
+
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(
+        repr(
+            conn.execute(
+                "SELECT COUNT(*), MAX(id), MAX(updated_at) FROM blockchain_contracts"
+            ).fetchone()
+        ).encode()
+    )
+    for row in conn.execute(
+        "SELECT code, native_currency_id, is_active, is_evm FROM networks ORDER BY code"
+    ):
+        digest.update(repr(row).encode())
+
+    return Path(db_file).parent / f".contract_mappings.{digest.hexdigest()}.json"
+
+
+def get_contract_mappings(
+    conn: sqlite3.Connection,
+) -> Tuple[Dict[str, Dict[str, Tuple[int, int]]], Dict[str, int], Dict[str, int]]:
+    """
+    Load ERC-20 and native token mappings for active networks.
+
+    Served from a JSON cache next to the database while the mappings are
+    unchanged (see _contract_mappings_cache_path).
+
+    Returns:
+        Tuple of (network -> {contract_address: (currency_id, decimals)},
+        network -> native decimals, network -> native currency_id)
+    """
+    cache_path = _contract_mappings_cache_path(conn)
+    if cache_path and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text())
+            contracts_by_network = {
+                network: {address: tuple(mapping) for address, mapping in contracts.items()}
+                for network, contracts in cached["contracts"].items()
+            }
+            return contracts_by_network, cached["native_decimals"], cached["native_currency_ids"]
+        except (OSError, ValueError, KeyError) as e:
+            logging.debug(f"Ignoring unreadable contract mappings cache {cache_path}: {e}")
+
     contracts_by_network = {}
     native_decimals = {}
     native_currency_ids = {}
@@ -267,14 +283,11 @@ def fetch_wallet_balances(db_path: str) -> List[Dict]:
         WHERE is_active = 1 AND contract_address IS NOT NULL AND is_native = 0
     """
     ):
-        network = row["network"]
+        network, contract_address, currency_id, decimals = row
         if network not in contracts_by_network:
             contracts_by_network[network] = {}
         # Normalize address to lowercase for consistent lookups
-        contracts_by_network[network][row["contract_address"].lower()] = (
-            row["currency_id"],
-            row["decimals"],
-        )
+        contracts_by_network[network][contract_address.lower()] = (currency_id, decimals)
 
     for row in conn.execute(
         """
@@ -285,17 +298,55 @@ def fetch_wallet_balances(db_path: str) -> List[Dict]:
         WHERE n.is_active = 1 AND n.is_evm = 1
     """
     ):
-        native_decimals[row["network"]] = row["decimals"]
-        native_currency_ids[row["network"]] = row["currency_id"]
+        network, currency_id, decimals = row
+        native_decimals[network] = decimals
+        native_currency_ids[network] = currency_id
 
-    conn.close()
+    if cache_path:
+        try:
+            # Drop caches for older versions of the mappings, then write atomically
+            for stale in cache_path.parent.glob(".contract_mappings.*.json"):
+                stale.unlink(missing_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            tmp_path.write_text(
+                json.dumps(
+                    {
+                        "contracts": contracts_by_network,
+                        "native_decimals": native_decimals,
+                        "native_currency_ids": native_currency_ids,
+                    }
+                )
+            )
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.debug(f"Could not write contract mappings cache {cache_path}: {e}")
 
-    # Transform contracts for adapter
-    contracts_for_adapter = {}
-    for network, contracts in contracts_by_network.items():
-        contracts_for_adapter[network] = {
-            addr: decimals for addr, (currency_id, decimals) in contracts.items()
-        }
+    return contracts_by_network, native_decimals, native_currency_ids
+
+
+def fetch_wallet_balances(conn: sqlite3.Connection) -> List[Dict]:
+    """Fetch balances from on-chain wallets (EVM)."""
+    from portfolio.blockchain import MultiChainAdapter
+
+    # Read all wallet configuration from one consistent snapshot
+    # and release it before the RPC calls
+    with read_tx(conn):
+        network_configs = get_network_configs(conn)
+        wallet_accounts = get_wallet_addresses(conn)
+        contracts_by_network, native_decimals, native_currency_ids = get_contract_mappings(conn)
+
+    if not network_configs:
+        logging.warning("No network RPC endpoints configured, skipping wallets")
+        return []
+
+    if not wallet_accounts:
+        logging.warning("No wallet addresses configured, skipping wallets")
+        return []
+
+    # The adapter only needs decimals; give it views instead of copying every contract
+    contracts_for_adapter = {
+        network: _ContractDecimals(contracts) for network, contracts in contracts_by_network.items()
+    }
 
     # Initialize adapter
     try:
@@ -304,21 +355,30 @@ def fetch_wallet_balances(db_path: str) -> List[Dict]:
         logging.error(f"Failed to initialize blockchain adapter: {e}")
         return []
 
-    # Fetch balances
-    all_balances = []
+    # Wallets are grouped by network so each network's contracts are scanned
+    # for every wallet at once; leaving the block closes the RPC connections
+    logging.info(f"Fetching from {len(wallet_accounts)} wallet accounts...")
+    with adapter:
+        try:
+            balances_by_account = adapter.fetch_accounts_balances(
+                {
+                    account_id: wallet_info["addresses"]
+                    for account_id, wallet_info in wallet_accounts.items()
+                },
+                known_contracts=contracts_for_adapter,
+                native_decimals=native_decimals,
+            )
+        except Exception as e:
+            logging.error(f"✗ Failed to fetch wallet balances - {e}")
+            return []
 
+    all_balances = []
     for account_id, wallet_info in wallet_accounts.items():
         account_name = wallet_info["account_name"]
         addresses = wallet_info["addresses"]
 
-        logging.info(f"Fetching from {account_name}...")
-
         try:
-            balances_by_network = adapter.fetch_wallet_balances(
-                wallet_addresses=addresses,
-                known_contracts=contracts_for_adapter,
-                native_decimals=native_decimals,
-            )
+            balances_by_network = balances_by_account[account_id]
 
             for network, balances in balances_by_network.items():
                 for balance in balances:
@@ -356,58 +416,100 @@ def fetch_wallet_balances(db_path: str) -> List[Dict]:
 # ============================================================================
 
 
-def fetch_sheet_balances(db_path: str) -> List[Dict]:
-    """Fetch balances from Google Sheets (fiat and crypto)."""
-    try:
-        from google.auth.transport.requests import Request
-        from google.oauth2.credentials import Credentials
-        from google.oauth2.service_account import Credentials as ServiceAccountCredentials
-        from googleapiclient.discovery import build
-    except ImportError:
-        logging.warning("Google API libraries not installed, skipping sheet balances")
-        return []
+@lru_cache(maxsize=4)
+def _sheets_service(creds_path: str, creds_mtime: float):
+    """
+    Build a read-only Google Sheets client.
+
+    Cached per (path, mtime) so repeated calls in the same process skip the key
+    parsing and client construction, while a rotated credentials file is
+    picked up on the next call.
+    """
+    from google.oauth2.service_account import Credentials as ServiceAccountCredentials
+    from googleapiclient.discovery import build
+
+    creds = ServiceAccountCredentials.from_service_account_file(
+        creds_path, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
+    )
+
+    # Use the discovery document bundled with google-api-python-client instead of
+    # downloading it on every run
+    return build("sheets", "v4", credentials=creds, static_discovery=True, cache_discovery=False)
+
+
+def read_google_sheet() -> Optional[List[List]]:
+    """
+    Read raw balance rows from Google Sheets.
 
+    Touches only the network, never the database, so main() can run it on a
+    worker thread while exchange and wallet balances are being fetched.
+
+    Returns:
+        Sheet rows, or None if the sheet is not configured or could not be read
+    """
     creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH")
     sheet_id = os.getenv("GOOGLE_SHEET_ID")
     sheet_range = os.getenv("GOOGLE_SHEET_RANGE")
 
     if not all([creds_path, sheet_id, sheet_range]):
         logging.warning("Google Sheets not configured, skipping sheet balances")
-        return []
+        return None
 
     try:
-        # Authenticate
-        creds = ServiceAccountCredentials.from_service_account_file(
-            creds_path, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
+        # Authenticate (reuses the client if the credentials file is unchanged)
+        service = _sheets_service(creds_path, os.path.getmtime(creds_path))
+        sheet = service.spreadsheets()
+
+        # Fetch data - one batchGet round-trip, raw numbers, and only the values field
+        result = (
+            sheet.values()
+            .batchGet(
+                spreadsheetId=sheet_id,
+                ranges=[sheet_range],
+                valueRenderOption="UNFORMATTED_VALUE",
+                majorDimension="ROWS",
+                fields="valueRanges(values)",
+            )
+            .execute()
         )
+        value_ranges = result.get("valueRanges", [])
+        return value_ranges[0].get("values", []) if value_ranges else []
 
-        service = build("sheets", "v4", credentials=creds)
-        sheet = service.spreadsheets()
+    except ImportError:
+        logging.warning("Google API libraries not installed, skipping sheet balances")
+        return None
+    except Exception as e:
+        logging.error(f"✗ Failed to read Google Sheets: {e}")
+        return None
 
-        # Fetch data
-        result = sheet.values().get(spreadsheetId=sheet_id, range=sheet_range).execute()
-        values = result.get("values", [])
 
-        if not values:
-            logging.warning("No data found in Google Sheets")
-            return []
+def fetch_sheet_balances(conn: sqlite3.Connection, values: Optional[List[List]]) -> List[Dict]:
+    """
+    Parse sheet rows (fiat and crypto) into balances.
 
-        logging.info(f"Fetched {len(values)} rows from Google Sheets")
+    Args:
+        conn: Database connection used to resolve account and currency IDs
+        values: Rows returned by read_google_sheet(), or None if it failed
 
-        # Get account and currency mappings
-        conn = sqlite3.connect(db_path)
-        accounts = {
-            row[0]: row[1]
-            for row in conn.execute("SELECT name, id FROM accounts WHERE is_active = 1").fetchall()
-        }
-        currencies = {
-            row[0]: row[1] for row in conn.execute("SELECT code, id FROM currencies").fetchall()
-        }
-        conn.close()
+    Returns:
+        List of aggregated balance dicts
+    """
+    if values is None:
+        return []
+
+    if not values:
+        logging.warning("No data found in Google Sheets")
+        return []
+
+    logging.info(f"Fetched {len(values)} rows from Google Sheets")
 
-        # Parse balances - aggregate duplicates and track errors
-        balance_dict = {}  # (account_id, currency_id) -> balance info
-        duplicate_count = 0
+    try:
+        # Parse balances - validate rows, then aggregate duplicates below
+        sheet_rows = []  # (idx, account_name, currency_code, quantity)
+        # (account_id, currency_id) -> quantities, summed after the loop
+        amounts = defaultdict(list)
+        names = {}  # (account_id, currency_id) -> (account_name, currency_code)
+        dup_events = []  # (idx, account_name, currency_code, added), logged once
 
         # Track issues for clean reporting
         missing_accounts = set()
@@ -420,51 +522,85 @@ def fetch_sheet_balances(db_path: str) -> List[Dict]:
                 skipped_rows.append(f"Row {idx}: Missing columns (has {len(row)}, needs 3)")
                 continue
 
-            account_name = row[0].strip()
-            currency_code = row[1].strip().upper()
-            amount_str = row[2].strip()
+            account_name = str(row[0]).strip()
+            currency_code = str(row[1]).strip().upper()
+            amount = row[2]
 
-            # Validate amount
+            # Validate amount (UNFORMATTED_VALUE returns numeric cells as int/float)
             try:
-                quantity = float(amount_str.replace(",", ""))
+                if isinstance(amount, (int, float)):
+                    quantity = float(amount)
+                else:
+                    quantity = float(_NUM_CLEAN.sub("", amount))
             except ValueError:
+                quantity = math.nan
+
+            # NaN/inf would bind as NULL (or poison the sums), so reject them here
+            if not math.isfinite(quantity):
                 invalid_amounts.append(
-                    f"Row {idx}: Invalid amount '{amount_str}' for {account_name}/{currency_code}"
+                    f"Row {idx}: Invalid amount '{amount}' for {account_name}/{currency_code}"
                 )
                 continue
 
-            # Check account exists
-            account_id = accounts.get(account_name)
-            if not account_id:
+            sheet_rows.append((idx, account_name, currency_code, quantity))
+
+        # Resolve account and currency IDs for all rows in one LEFT JOIN
+        try:
+            conn.execute(
+                """
+                CREATE TEMP TABLE sheet_rows (
+                    idx         INTEGER PRIMARY KEY,
+                    account     TEXT NOT NULL,
+                    currency    TEXT NOT NULL,
+                    quantity    REAL NOT NULL
+                )
+            """
+            )
+            conn.executemany(
+                "INSERT INTO sheet_rows (idx, account, currency, quantity) VALUES (?, ?, ?, ?)",
+                sheet_rows,
+            )
+            resolved = conn.execute(
+                """
+                SELECT s.idx, s.account, s.currency, s.quantity, a.id, c.id
+                FROM sheet_rows s
+                LEFT JOIN accounts a ON a.name = s.account AND a.is_active = 1
+                LEFT JOIN currencies c ON c.code = s.currency
+                ORDER BY s.idx
+            """
+            ).fetchall()
+        finally:
+            # Runs on failure too, so the next call (and main()'s write_tx) starts clean
+            conn.execute("DROP TABLE IF EXISTS temp.sheet_rows")
+            conn.commit()  # Only temp data was written; don't hold the read snapshot open
+
+        for idx, account_name, currency_code, quantity, account_id, currency_id in resolved:
+            if account_id is None:
                 missing_accounts.add(account_name)
                 continue
 
-            # Check currency exists
-            currency_id = currencies.get(currency_code)
-            if not currency_id:
+            if currency_id is None:
                 missing_currencies.add(currency_code)
                 continue
 
             key = (account_id, currency_id)
-
-            # Aggregate duplicates
-            if key in balance_dict:
-                old_quantity = balance_dict[key]["quantity"]
-                new_quantity = old_quantity + quantity
-                balance_dict[key]["quantity"] = new_quantity
-                duplicate_count += 1
-                logging.debug(
-                    f"Row {idx}: Duplicate sheet entry for {account_name} / {currency_code} "
-                    f"(aggregating: {old_quantity:,.2f} + {quantity:,.2f} = {new_quantity:,.2f})"
-                )
+            if key in names:
+                dup_events.append((idx, account_name, currency_code, quantity))
             else:
-                balance_dict[key] = {
-                    "account_id": account_id,
-                    "account_name": account_name,
-                    "currency_id": currency_id,
-                    "quantity": quantity,
-                    "source": "sheet",
-                }
+                names[key] = (account_name, currency_code)
+            amounts[key].append(quantity)
+
+        all_balances = [
+            {
+                "account_id": account_id,
+                "account_name": names[(account_id, currency_id)][0],
+                "currency_id": currency_id,
+                # fsum is exact, so the total doesn't depend on the order of duplicate rows
+                "quantity": math.fsum(quantities),
+                "source": "sheet",
+            }
+            for (account_id, currency_id), quantities in amounts.items()
+        ]
 
         # Print clean summary of issues
         if missing_accounts or missing_currencies or invalid_amounts or skipped_rows:
@@ -500,10 +636,18 @@ def fetch_sheet_balances(db_path: str) -> List[Dict]:
 
             logging.warning("=" * 70)
 
-        if duplicate_count > 0:
-            logging.info(f"✓ Aggregated {duplicate_count} duplicate entries")
+        # Duplicate (account, currency) rows were summed; report them in one record
+        if dup_events:
+            lines = [
+                f"  • Row {idx}: {account}/{currency} += {added:,.2f}"
+                for idx, account, currency, added in dup_events[:50]
+            ]
+            if len(dup_events) > 50:
+                lines.append(f"  ... and {len(dup_events) - 50} more")
+            logging.info(
+                "✓ Aggregated %d duplicate entries:\n%s", len(dup_events), "\n".join(lines)
+            )
 
-        all_balances = list(balance_dict.values())
         logging.info(f"✓ Parsed {len(all_balances)} sheet balances")
         return all_balances
 
@@ -517,13 +661,9 @@ def fetch_sheet_balances(db_path: str) -> List[Dict]:
 # ============================================================================
 
 
-def add_currency_ids(balances: List[Dict], db_path: str) -> List[Dict]:
+def add_currency_ids(balances: List[Dict], conn: sqlite3.Connection) -> List[Dict]:
     """Add currency_id to balances that only have currency code."""
-    conn = sqlite3.connect(db_path)
-    currencies = {
-        row[0]: row[1] for row in conn.execute("SELECT code, id FROM currencies").fetchall()
-    }
-    conn.close()
+    currencies = dict(conn.execute("SELECT code, id FROM currencies"))
 
     # Track missing currencies from exchanges
     missing_currencies = set()
@@ -551,53 +691,75 @@ def add_currency_ids(balances: List[Dict], db_path: str) -> List[Dict]:
     return balances
 
 
-def calculate_values(balances: List[Dict], db_path: str) -> List[Dict]:
-    """Calculate USD and IDR values using FX rates."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+def _value_balances(conn: sqlite3.Connection, pending: List[Tuple]) -> List[Tuple]:
+    """
+    Value (idx, currency_id, quantity) rows in one JOIN against fx_rates.
 
-    fx_rates = {
-        row["currency_id"]: row["rate"]
-        for row in conn.execute("SELECT currency_id, rate FROM fx_rates").fetchall()
-    }
+    The rate lookups and the multiply/divide all run inside this single
+    statement, so Python touches each balance only once, to store the result.
+    """
+    # Stage balances in a temp table so the valuation runs as one JOIN
+    conn.execute(
+        """
+        CREATE TEMP TABLE balance_values (
+            idx         INTEGER PRIMARY KEY,
+            currency_id INTEGER NOT NULL,
+            quantity    REAL NOT NULL
+        )
+    """
+    )
+    conn.executemany(
+        "INSERT INTO balance_values (idx, currency_id, quantity) VALUES (?, ?, ?)", pending
+    )
 
-    # Get currency code lookup for better error messages
-    currency_codes = {
-        row["id"]: row["code"] for row in conn.execute("SELECT id, code FROM currencies").fetchall()
-    }
+    # Rates of 0 are treated as missing; dividing by a NULL/0 IDR rate yields NULL.
+    # The IDR rate and currency codes (for error messages) come from the same statement.
+    rows = conn.execute(
+        """
+        SELECT
+            bv.idx,
+            c.code,
+            bv.quantity * NULLIF(fx.rate, 0) AS value_usd,
+            bv.quantity * NULLIF(fx.rate, 0) / (
+                SELECT idr_fx.rate
+                FROM fx_rates idr_fx
+                INNER JOIN currencies idr ON idr.id = idr_fx.currency_id
+                WHERE idr.code = 'IDR'
+            ) AS value_idr
+        FROM balance_values bv
+        LEFT JOIN fx_rates fx ON fx.currency_id = bv.currency_id
+        LEFT JOIN currencies c ON c.id = bv.currency_id
+        ORDER BY bv.idx
+    """
+    ).fetchall()
+    conn.execute("DROP TABLE temp.balance_values")
+    return rows
 
-    idr_currency_id = conn.execute("SELECT id FROM currencies WHERE code = 'IDR'").fetchone()
-    idr_rate = fx_rates.get(idr_currency_id["id"]) if idr_currency_id else None
 
-    conn.close()
+def calculate_values(balances: List[Dict], conn: sqlite3.Connection) -> List[Dict]:
+    """Calculate USD and IDR values using FX rates."""
+    pending = [
+        (idx, balance["currency_id"], balance["quantity"])
+        for idx, balance in enumerate(balances)
+        if not balance.get("skip")
+    ]
+    rows = _value_balances(conn, pending)
 
     # Track missing FX rates
     missing_fx_rates = set()
 
-    for balance in balances:
-        if balance.get("skip"):
-            continue
-
-        currency_id = balance["currency_id"]
-        rate_to_usd = fx_rates.get(currency_id)
+    for idx, currency_code, value_usd, value_idr in rows:
+        balance = balances[idx]
 
-        if not rate_to_usd:
-            currency_code = currency_codes.get(currency_id, f"ID:{currency_id}")
-            missing_fx_rates.add(currency_code)
+        if value_usd is None:
+            missing_fx_rates.add(currency_code or f"ID:{balance['currency_id']}")
             balance["value_usd"] = None
             balance["value_idr"] = None
             balance["skip"] = True
             continue
 
-        quantity = balance["quantity"]
-        value_usd = quantity * rate_to_usd
         balance["value_usd"] = value_usd
-
-        if idr_rate:
-            balance["value_idr"] = value_usd / idr_rate
-        else:
-            balance["value_idr"] = None
-
+        balance["value_idr"] = value_idr
         balance["skip"] = False
 
     # Print clean summary of missing FX rates
@@ -615,81 +777,93 @@ def calculate_values(balances: List[Dict], db_path: str) -> List[Dict]:
     return balances
 
 
-def add_zero_balances_for_sold_assets(current_balances: List[Dict], db_path: str) -> List[Dict]:
+@dataclass
+class BalanceBatch:
+    """Balances of one snapshot plus the (account_id, currency_id) keys they hold."""
+
+    balances: List[Dict]
+    holdings: Set[Tuple[int, int]] = field(default_factory=set)
+    # True when no two unskipped balances share a key, so insert needs no aggregation
+    unique: bool = True
+
+    @classmethod
+    def from_balances(cls, balances: List[Dict]) -> "BalanceBatch":
+        """Build the holdings set in one pass over the unskipped balances."""
+        keys = [(bal["account_id"], bal["currency_id"]) for bal in balances if not bal.get("skip")]
+        holdings = set(keys)
+        return cls(balances, holdings, unique=len(holdings) == len(keys))
+
+
+def add_zero_balances_for_sold_assets(
+    batch: BalanceBatch, conn: sqlite3.Connection
+) -> BalanceBatch:
     """
     Add zero balances for previously held assets.
 
     ONLY call this when running ALL sources together!
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
-    # Filter out balances that should be skipped (missing currency_id, etc.)
-    valid_balances = [bal for bal in current_balances if not bal.get("skip")]
-
-    current_holdings = {(bal["account_id"], bal["currency_id"]) for bal in valid_balances}
+    # Holdings exclude balances that should be skipped (missing currency_id, etc.)
+    current_holdings = batch.holdings
 
-    cursor = conn.execute(
+    # Let SQLite diff the latest holdings against this run instead of pulling
+    # every historical holding into Python; only sold positions come back
+    conn.execute(
         """
-        SELECT DISTINCT account_id, currency_id
-        FROM latest_balances
-        WHERE quantity > 0
+        CREATE TEMP TABLE current_holdings (
+            account_id  INTEGER NOT NULL,
+            currency_id INTEGER NOT NULL,
+            PRIMARY KEY (account_id, currency_id)
+        ) WITHOUT ROWID
     """
     )
-
-    historical_holdings = {(row["account_id"], row["currency_id"]) for row in cursor.fetchall()}
-
-    sold_holdings = historical_holdings - current_holdings
-
-    if sold_holdings:
-        # Get account and currency names for logging
-        cursor = conn.execute(
-            """
-            SELECT id, name FROM accounts
-        """
-        )
-        account_names = {row["id"]: row["name"] for row in cursor.fetchall()}
-
-        cursor = conn.execute(
-            """
-            SELECT id, code FROM currencies
+    conn.executemany(
+        "INSERT INTO current_holdings (account_id, currency_id) VALUES (?, ?)",
+        current_holdings,
+    )
+    sold_holdings = conn.execute(
         """
+        SELECT lb.account_id, lb.currency_id, lb.account_name, lb.currency_code
+        FROM latest_balances lb
+        WHERE lb.quantity > 0
+        AND NOT EXISTS (
+            SELECT 1 FROM current_holdings ch
+            WHERE ch.account_id = lb.account_id
+            AND ch.currency_id = lb.currency_id
         )
-        currency_codes = {row["id"]: row["code"] for row in cursor.fetchall()}
+        ORDER BY lb.account_id, lb.currency_id
+    """
+    ).fetchall()
+    conn.execute("DROP TABLE temp.current_holdings")
 
+    if sold_holdings:
         # Log zeroed holdings
         logging.warning("=" * 70)
         logging.warning("ZERO-BALANCE TRACKING")
         logging.warning("=" * 70)
         logging.warning(f"🔄 Recording {len(sold_holdings)} asset(s) now at zero:")
 
-        for account_id, currency_id in sorted(sold_holdings):
-            account_name = account_names.get(account_id, f"Account#{account_id}")
-            currency_code = currency_codes.get(currency_id, f"Currency#{currency_id}")
+        for _, _, account_name, currency_code in sold_holdings:
             logging.warning(f"  • {account_name} / {currency_code} → 0.00")
 
         logging.warning("=" * 70)
 
-        for account_id, currency_id in sold_holdings:
-            current_balances.append(
+        # Sold keys are by construction absent from the holdings set, so the
+        # zero rows keep the batch unique
+        for account_id, currency_id, _, _ in sold_holdings:
+            batch.balances.append(
                 {
                     "account_id": account_id,
                     "currency_id": currency_id,
                     "quantity": 0.0,
                 }
             )
+            current_holdings.add((account_id, currency_id))
 
-    conn.close()
+    return batch
 
-    return current_balances
 
-
-def insert_balances(balances: List[Dict], db_path: str, timestamp: datetime) -> int:
-    """Insert balance snapshot into database."""
-    conn = sqlite3.connect(db_path)
-    conn.execute("PRAGMA foreign_keys = ON")
-
-    # Deduplicate: aggregate balances by (account_id, currency_id)
+def _aggregate_duplicates(balances: List[Dict]) -> List[Dict]:
+    """Aggregate balances sharing an (account_id, currency_id) key."""
     balance_dict = {}
 
     for balance in balances:
@@ -714,37 +888,49 @@ def insert_balances(balances: List[Dict], db_path: str, timestamp: datetime) ->
         else:
             balance_dict[key] = balance.copy()
 
-    inserted = 0
+    return list(balance_dict.values())
+
+
+def insert_balances(batch: BalanceBatch, conn: sqlite3.Connection, timestamp: datetime) -> int:
+    """
+    Insert balance snapshot into database.
+
+    Runs inside the caller's transaction; the caller commits or rolls back.
+    """
+    # Deduplicate: aggregate balances by (account_id, currency_id). Skipping
+    # rows later (missing FX rates) can't create duplicates, so a batch that
+    # was unique when built is streamed as-is
+    if batch.unique:
+        rows = [balance for balance in batch.balances if not balance.get("skip")]
+    else:
+        rows = _aggregate_duplicates(batch.balances)
+
+    # Every row of a snapshot shares one timestamp; format it once
+    ts_iso = timestamp.isoformat()
 
     try:
-        for balance in balance_dict.values():
-            conn.execute(
-                """
-                INSERT INTO balances (
-                    timestamp, account_id, currency_id,
-                    quantity, value_idr, value_usd
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """,
+        # Rows are streamed into the prepared statement; rowcount sums the inserts
+        cursor = conn.executemany(
+            _INSERT_BALANCE_SQL,
+            (
                 (
-                    timestamp.isoformat(),
+                    ts_iso,
                     balance["account_id"],
                     balance["currency_id"],
                     balance["quantity"],
                     balance["value_idr"],
                     balance["value_usd"],
-                ),
-            )
-            inserted += 1
+                )
+                for balance in rows
+            ),
+        )
+        inserted = cursor.rowcount
 
-        conn.commit()
         logging.info(f"Inserted {inserted} balance records")
 
     except sqlite3.Error as e:
         logging.error(f"Database error: {e}")
-        conn.rollback()
         raise
-    finally:
-        conn.close()
 
     return inserted
 
@@ -768,7 +954,7 @@ def main():
     log_dir = project_root / "logs"
     lock_file = project_root / "data" / ".balances.lock"
 
-    logger = setup_logging(log_dir)
+    logger = setup_logging(log_dir, "balances")
 
     logger.info("=" * 70)
     logger.info(f"Balance Ingestion - Starting (sources: {args.sources})")
@@ -776,25 +962,32 @@ def main():
     logger.info(f"Database: {db_path}")
 
     try:
-        with LockFile(lock_file):
+        with LockFile(lock_file), ThreadPoolExecutor(max_workers=1) as pool:
             logger.info("Lock acquired successfully")
+            conn = get_writer(str(db_path))
+
+            # The sheet read only needs the network; start it now so it overlaps
+            # the exchange and wallet fetches below
+            sheet_future = None
+            if args.sources in ["all", "sheet"]:
+                sheet_future = pool.submit(read_google_sheet)
 
             all_balances = []
 
             # Fetch from selected sources
             if args.sources in ["all", "exchanges"]:
                 logger.info("--- Fetching Exchange Balances ---")
-                exchange_balances = fetch_exchange_balances(str(db_path))
+                exchange_balances = fetch_exchange_balances(conn)
                 all_balances.extend(exchange_balances)
 
             if args.sources in ["all", "wallets"]:
                 logger.info("--- Fetching Wallet Balances ---")
-                wallet_balances = fetch_wallet_balances(str(db_path))
+                wallet_balances = fetch_wallet_balances(conn)
                 all_balances.extend(wallet_balances)
 
-            if args.sources in ["all", "sheet"]:
+            if sheet_future is not None:
                 logger.info("--- Fetching Sheet Balances ---")
-                sheet_balances = fetch_sheet_balances(str(db_path))
+                sheet_balances = fetch_sheet_balances(conn, sheet_future.result())
                 all_balances.extend(sheet_balances)
 
             if not all_balances:
@@ -803,27 +996,35 @@ def main():
 
             logger.info(f"\nTotal balances fetched: {len(all_balances)}")
 
-            # Add currency IDs for exchange balances (they only have currency code)
-            logger.info("Mapping currency codes to IDs...")
-            all_balances = add_currency_ids(all_balances, str(db_path))
-
-            # Add zero balances ONLY when running all sources
-            if args.sources == "all":
-                logger.info("Checking for sold/transferred assets...")
-                all_balances = add_zero_balances_for_sold_assets(all_balances, str(db_path))
-            else:
-                logger.info(
-                    "Skipping zero-balance check (not running all sources - incomplete picture)"
-                )
-
-            # Calculate values
-            logger.info("Calculating USD and IDR values...")
-            all_balances = calculate_values(all_balances, str(db_path))
-
-            # Insert snapshot
-            snapshot_time = datetime.now()
-            logger.info(f"Creating snapshot at {snapshot_time.isoformat()}")
-            inserted = insert_balances(all_balances, str(db_path), snapshot_time)
+            # Map, value and insert under one write lock so the FX rates and
+            # holdings read below can't change before the snapshot lands
+            with write_tx(conn):
+                # Add currency IDs for exchange balances (they only have currency code)
+                logger.info("Mapping currency codes to IDs...")
+                all_balances = add_currency_ids(all_balances, conn)
+                batch = BalanceBatch.from_balances(all_balances)
+
+                # Add zero balances ONLY when running all sources
+                if args.sources == "all":
+                    logger.info("Checking for sold/transferred assets...")
+                    batch = add_zero_balances_for_sold_assets(batch, conn)
+                else:
+                    logger.info(
+                        "Skipping zero-balance check (not running all sources - incomplete picture)"
+                    )
+
+                # Calculate values
+                logger.info("Calculating USD and IDR values...")
+                batch.balances = calculate_values(batch.balances, conn)
+
+                # Insert snapshot
+                snapshot_time = datetime.now()
+                logger.info(f"Creating snapshot at {snapshot_time.isoformat()}")
+                inserted = insert_balances(batch, conn, snapshot_time)
+
+            # Refresh planner statistics for tables that changed enough to need it,
+            # so latest_balances keeps using the covering index as balances grows
+            conn.execute("PRAGMA optimize")
 
             # Summary
             logger.info("=" * 70)
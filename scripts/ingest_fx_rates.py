@@ -6,91 +6,27 @@ Fetches current FX rates from TradingView and updates the database.
 Designed to run via cron with proper locking and logging.
 
 Usage:
-    python scripts/ingest_fx_rates.py [database_path]
+    python scripts/ingest_fx_rates.py [database_path] [--force]
 
     If no database_path is provided, defaults to 'data/portfolio.db'
+    Rates updated within the last hour are skipped unless --force is given
 
 Example cron (daily at 9 AM):
     0 9 * * * cd /path/to/personal-finance && python scripts/ingest_fx_rates.py >> logs/fx_rates.log 2>&1
 """
 
-import sys
-import sqlite3
+import argparse
 import logging
+import sqlite3
+import sys
 from pathlib import Path
-from datetime import datetime
-import fcntl
-import os
 
 # Add src directory to path to import portfolio package
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from portfolio.tradingview import fetch_and_update_prices, check_stale_rates
-
+from _common import LockFile, connect_ro, setup_logging
 
-# Configure logging
-def setup_logging(log_dir: Path):
-    """Setup logging to both file and console."""
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-
-    # File handler (with rotation)
-    log_file = log_dir / f"fx_rates_{datetime.now().strftime('%Y%m')}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-
-    # Configure root logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-
-    return logger
-
-
-class LockFile:
-    """Context manager for file-based locking to prevent concurrent runs."""
-
-    def __init__(self, lock_path: Path):
-        self.lock_path = lock_path
-        self.lock_file = None
-
-    def __enter__(self):
-        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-        self.lock_file = open(self.lock_path, 'w')
-
-        try:
-            # Non-blocking lock
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_file.write(f"{os.getpid()}\n{datetime.now().isoformat()}\n")
-            self.lock_file.flush()
-            return self
-        except IOError:
-            self.lock_file.close()
-            raise RuntimeError(
-                f"Another instance is already running (lock file: {self.lock_path})"
-            )
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.lock_file:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
-            self.lock_file.close()
-            # Clean up lock file
-            try:
-                self.lock_path.unlink()
-            except:
-                pass
+from portfolio.tradingview import DEFAULT_TTL_HOURS, check_stale_rates, fetch_and_update_prices
 
 
 def validate_database(db_path: Path) -> bool:
@@ -108,11 +44,12 @@ def validate_database(db_path: Path) -> bool:
         return False
 
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect_ro(db_path)
         cursor = conn.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name IN ('currencies', 'symbol_mappings', 'fx_rates')"
+            "SELECT name FROM sqlite_master"
+            " WHERE type='table' AND name IN ('currencies', 'symbol_mappings', 'fx_rates')"
         )
-        tables = [row[0] for row in cursor.fetchall()]
+        tables = [row[0] for row in cursor]
         conn.close()
 
         required_tables = {'currencies', 'symbol_mappings', 'fx_rates'}
@@ -131,7 +68,21 @@ def validate_database(db_path: Path) -> bool:
 def main():
     """Main entry point."""
     # Parse arguments
-    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("data/portfolio.db")
+    parser = argparse.ArgumentParser(description="Fetch FX rates from TradingView")
+    parser.add_argument(
+        "database",
+        nargs="?",
+        default="data/portfolio.db",
+        help="Path to SQLite database (default: data/portfolio.db)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Refetch rates updated within the last {DEFAULT_TTL_HOURS}h",
+    )
+
+    args = parser.parse_args()
+    db_path = Path(args.database)
 
     # Setup paths
     project_root = Path(__file__).parent.parent
@@ -139,7 +90,7 @@ def main():
     lock_file = project_root / "data" / ".fx_rates.lock"
 
     # Setup logging
-    logger = setup_logging(log_dir)
+    logger = setup_logging(log_dir, "fx_rates")
 
     logger.info("=" * 70)
     logger.info("FX Rate Ingestion - Starting")
@@ -166,13 +117,16 @@ def main():
 
             # Fetch and update prices
             logger.info("Fetching prices from TradingView...")
-            updated_count = fetch_and_update_prices(str(db_path))
+            ttl_hours = 0 if args.force else DEFAULT_TTL_HOURS
+            result = fetch_and_update_prices(str(db_path), ttl_hours=ttl_hours)
+            stale_after = check_stale_rates(str(db_path), hours=24)
 
-            if updated_count > 0:
-                logger.info(f"✓ Successfully updated {updated_count} FX rates")
+            # Updating nothing is fine when every rate was skipped as fresh;
+            # any symbol that failed to fetch or write fails the run
+            if not result.failed:
+                logger.info(f"✓ Successfully updated {result.total_updated} FX rates")
 
                 # Check for remaining stale rates
-                stale_after = check_stale_rates(str(db_path), hours=24)
                 if stale_after:
                     logger.warning(f"Still have {len(stale_after)} stale rates:")
                     for rate in stale_after:
@@ -189,7 +143,12 @@ def main():
                 logger.info("=" * 70)
                 sys.exit(0)
             else:
-                logger.error("✗ No FX rates were updated")
+                logger.error(
+                    f"✗ {len(result.failed)} FX rates failed to update"
+                    f" ({result.total_updated} updated):"
+                )
+                for currency_code, reason in result.failed:
+                    logger.error(f"  • {currency_code}: {reason}")
                 logger.error("=" * 70)
                 logger.error("FX Rate Ingestion - Failed")
                 logger.error("=" * 70)
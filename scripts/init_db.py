@@ -19,6 +19,8 @@ import sqlite3
 import sys
 from pathlib import Path
 
+from _common import connect
+
 
 def init_database(db_path: str = "portfolio.db") -> None:
     """
@@ -39,21 +41,19 @@ def init_database(db_path: str = "portfolio.db") -> None:
 
     # Create/connect to database
     print(f"Initializing database at: {db_path}")
-    conn = sqlite3.connect(db_path)
+    conn = connect(db_path)
 
     try:
-        # Enable foreign keys
-        conn.execute("PRAGMA foreign_keys = ON")
-
-        # Execute schema
-        conn.executescript(schema_sql)
-        conn.commit()
+        # Execute schema as one exclusive transaction (connect() already
+        # enabled WAL and foreign keys): a single commit instead of one per
+        # CREATE statement, and no other connection sees a half-built schema
+        conn.executescript(f"BEGIN EXCLUSIVE;\n{schema_sql}\nCOMMIT;")
 
         # Verify tables were created
         cursor = conn.execute(
             "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
         )
-        tables = [row[0] for row in cursor.fetchall()]
+        tables = [row[0] for row in cursor]
 
         print("\n✓ Database initialized successfully!")
         print(f"\nCreated {len(tables)} tables:")
@@ -64,7 +64,7 @@ def init_database(db_path: str = "portfolio.db") -> None:
         cursor = conn.execute(
             "SELECT name FROM sqlite_master WHERE type='view' ORDER BY name"
         )
-        views = [row[0] for row in cursor.fetchall()]
+        views = [row[0] for row in cursor]
 
         print(f"\nCreated {len(views)} views:")
         for view in views:
@@ -72,16 +72,19 @@ def init_database(db_path: str = "portfolio.db") -> None:
 
         # Show seed data
         cursor = conn.execute("SELECT name FROM currency_types")
-        currency_types = [row[0] for row in cursor.fetchall()]
+        currency_types = [row[0] for row in cursor]
         print(f"\nSeeded currency_types: {', '.join(currency_types)}")
 
         cursor = conn.execute("SELECT name FROM account_types")
-        account_types = [row[0] for row in cursor.fetchall()]
+        account_types = [row[0] for row in cursor]
         print(f"Seeded account_types: {', '.join(account_types)}")
 
         print("\n✓ Database is ready for use!")
 
     except sqlite3.Error as e:
+        # A failing statement leaves the schema transaction open
+        if conn.in_transaction:
+            conn.rollback()
         print(f"\n✗ Error initializing database: {e}")
         sys.exit(1)
     finally:
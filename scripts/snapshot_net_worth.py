@@ -8,7 +8,7 @@ and stores them in the net_worth_history table.
 Features:
 - Always snapshots today's date (historical dates handled by separate backfill script)
 - Uses UPSERT logic to prevent duplicates (safe for multiple runs per day)
-- Lock file prevents concurrent execution
+- The SQLite write lock prevents concurrent execution (no separate lock file)
 
 Usage:
     python scripts/snapshot_net_worth.py
@@ -18,9 +18,7 @@ Example cron (daily at 11:59 PM):
 """
 
 import argparse
-import fcntl
 import logging
-import os
 import sqlite3
 import sys
 from datetime import datetime
@@ -29,93 +27,47 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from _common import get_writer, setup_logging, write_tx
 
-def setup_logging(log_dir: Path) -> logging.Logger:
-    """Setup logging to both file and console."""
-    log_dir.mkdir(parents=True, exist_ok=True)
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    logger.handlers.clear()
-
-    # Monthly log rotation
-    log_file = log_dir / f"snapshot_{datetime.now().strftime('%Y%m')}.log"
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    return logger
-
-
-class LockFile:
-    """Context manager for file-based locking."""
-
-    def __init__(self, lock_path: Path):
-        self.lock_path = lock_path
-        self.lock_file = None
-
-    def __enter__(self):
-        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-        self.lock_file = open(self.lock_path, "w")
-        try:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self.lock_file.write(f"{os.getpid()}\n{datetime.now().isoformat()}\n")
-            self.lock_file.flush()
-            return self
-        except IOError:
-            self.lock_file.close()
-            raise RuntimeError(
-                f"Another instance is already running (lock file: {self.lock_path})"
-            )
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.lock_file:
-            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
-            self.lock_file.close()
-            try:
-                self.lock_path.unlink()
-            except:
-                pass
-
-
-def get_net_worth_summary(db_path: str):
+def get_net_worth_summary(conn: sqlite3.Connection):
     """
-    Calculate today's net worth summary using the net_worth_summary view.
+    Calculate today's net worth summary from latest_balances.
 
     Args:
-        db_path: Path to SQLite database
+        conn: Database connection
 
     Returns:
         Dict with assets, liabilities, net worth in IDR and USD
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
-    # Query the net_worth_summary view for today's data
+    # One scan of latest_balances: each row is classified through the
+    # asset/liability account views and the totals and the row count are
+    # aggregated together (net_worth_summary would scan it once per total)
     query = """
+        WITH lb AS (
+            SELECT
+                lb.value_idr,
+                lb.value_usd,
+                CASE
+                    WHEN aa.id IS NOT NULL THEN 'Assets'
+                    WHEN la.id IS NOT NULL THEN 'Liabilities'
+                END as category
+            FROM latest_balances lb
+            LEFT JOIN asset_accounts aa ON aa.id = lb.account_id
+            LEFT JOIN liability_accounts la ON la.id = lb.account_id
+        )
         SELECT
-            MAX(CASE WHEN category = 'Assets' THEN total_idr ELSE 0 END) as assets_idr,
-            MAX(CASE WHEN category = 'Assets' THEN total_usd ELSE 0 END) as assets_usd,
-            MAX(CASE WHEN category = 'Liabilities' THEN total_idr ELSE 0 END) as liabilities_idr,
-            MAX(CASE WHEN category = 'Liabilities' THEN total_usd ELSE 0 END) as liabilities_usd,
-            (SELECT COUNT(*) FROM latest_balances) as num_balances
-        FROM net_worth_summary
-        WHERE category IN ('Assets', 'Liabilities')
+            SUM(CASE WHEN category = 'Assets' THEN value_idr END) as assets_idr,
+            SUM(CASE WHEN category = 'Assets' THEN value_usd END) as assets_usd,
+            SUM(CASE WHEN category = 'Liabilities' THEN value_idr END) as liabilities_idr,
+            SUM(CASE WHEN category = 'Liabilities' THEN value_usd END) as liabilities_usd,
+            COUNT(*) as num_balances
+        FROM lb
     """
-    cursor = conn.execute(query)
-    row = cursor.fetchone()
-    conn.close()
+    # Row access by name on this cursor only; the connection is shared
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    row = cursor.execute(query).fetchone()
 
     if not row:
         return None
@@ -138,28 +90,26 @@ def get_net_worth_summary(db_path: str):
     }
 
 
-def save_snapshot(db_path: str, snapshot: dict) -> bool:
+def save_snapshot(conn: sqlite3.Connection, snapshot: dict) -> bool:
     """
     Save net worth snapshot to database.
 
-    Uses INSERT OR REPLACE to handle duplicates (idempotent).
+    Upserts on snapshot_date, so re-running on the same day updates the row
+    in place (idempotent). Runs inside the caller's write transaction.
 
     Args:
-        db_path: Path to SQLite database
+        conn: Database connection
         snapshot: Dict with snapshot data
 
     Returns:
         True if inserted/updated, False if failed
     """
     try:
-        conn = sqlite3.connect(db_path)
-        conn.execute("PRAGMA foreign_keys = ON")
-
-        # Use INSERT OR REPLACE to handle duplicates
-        # This will update if snapshot_date already exists (UNIQUE constraint)
+        # Update in place if snapshot_date already exists (UNIQUE constraint);
+        # unlike INSERT OR REPLACE this keeps the row's id and created_at
         conn.execute(
             """
-            INSERT OR REPLACE INTO net_worth_history (
+            INSERT INTO net_worth_history (
                 snapshot_date,
                 assets_idr,
                 assets_usd,
@@ -169,6 +119,15 @@ def save_snapshot(db_path: str, snapshot: dict) -> bool:
                 net_worth_usd,
                 num_balances
             ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(snapshot_date) DO UPDATE SET
+                assets_idr = excluded.assets_idr,
+                assets_usd = excluded.assets_usd,
+                liabilities_idr = excluded.liabilities_idr,
+                liabilities_usd = excluded.liabilities_usd,
+                net_worth_idr = excluded.net_worth_idr,
+                net_worth_usd = excluded.net_worth_usd,
+                num_balances = excluded.num_balances,
+                updated_at = CURRENT_TIMESTAMP
         """,
             (
                 snapshot["snapshot_date"],
@@ -182,9 +141,6 @@ def save_snapshot(db_path: str, snapshot: dict) -> bool:
             ),
         )
 
-        conn.commit()
-        conn.close()
-
         return True
 
     except sqlite3.Error as e:
@@ -192,18 +148,6 @@ def save_snapshot(db_path: str, snapshot: dict) -> bool:
         return False
 
 
-def snapshot_exists(db_path: str, snapshot_date: str) -> bool:
-    """Check if a snapshot already exists for a given date."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.execute(
-        "SELECT COUNT(*) FROM net_worth_history WHERE snapshot_date = ?",
-        (snapshot_date,),
-    )
-    count = cursor.fetchone()[0]
-    conn.close()
-    return count > 0
-
-
 def create_snapshot(db_path: str) -> bool:
     """
     Create a snapshot for today.
@@ -213,28 +157,31 @@ def create_snapshot(db_path: str) -> bool:
 
     Returns:
         True if successful, False otherwise
-    """
-    # Get today's net worth summary
-    summary = get_net_worth_summary(db_path)
 
-    if summary is None:
-        logging.warning("No data available")
-        return False
+    Raises:
+        RuntimeError: If another writer holds the database lock
+    """
+    # The write transaction is also the run's mutex: a second instance
+    # waits out the busy timeout here and then gives up
+    with write_tx(get_writer(db_path)) as conn:
+        # Get today's net worth summary
+        summary = get_net_worth_summary(conn)
 
-    if summary["num_balances"] == 0:
-        logging.warning("No balances found")
-        return False
+        if summary is None:
+            logging.warning("No data available")
+            return False
 
-    snapshot_date = summary["snapshot_date"]
+        if summary["num_balances"] == 0:
+            logging.warning("No balances found")
+            return False
 
-    # Check if updating existing snapshot
-    exists = snapshot_exists(db_path, snapshot_date)
-    action = "Updated" if exists else "Created"
+        # Save snapshot
+        saved = save_snapshot(conn, summary)
 
-    # Save snapshot
-    if save_snapshot(db_path, summary):
+    snapshot_date = summary["snapshot_date"]
+    if saved:
         logging.info(
-            f"✓ {action} snapshot for {snapshot_date}: "
+            f"✓ Saved snapshot for {snapshot_date}: "
             f"Assets=${summary['assets_usd']:,.2f}, "
             f"Liabilities=${summary['liabilities_usd']:,.2f}, "
             f"Net Worth=${summary['net_worth_usd']:,.2f} "
@@ -262,10 +209,9 @@ def main():
     # Setup paths
     project_root = Path(__file__).parent.parent
     log_dir = project_root / "logs"
-    lock_file = project_root / "data" / ".snapshot.lock"
 
     # Setup logging
-    logger = setup_logging(log_dir)
+    logger = setup_logging(log_dir, "snapshot")
 
     logger.info("=" * 70)
     logger.info("Net Worth Snapshot - Starting")
@@ -273,23 +219,20 @@ def main():
     logger.info(f"Database: {db_path}")
 
     try:
-        with LockFile(lock_file):
-            logger.info("✓ Lock acquired")
-
-            if not db_path.exists():
-                logger.error(f"Database not found: {db_path}")
-                sys.exit(1)
-
-            if create_snapshot(str(db_path)):
-                logger.info("=" * 70)
-                logger.info("✓ Snapshot completed successfully")
-                logger.info("=" * 70)
-                sys.exit(0)
-            else:
-                logger.error("=" * 70)
-                logger.error("✗ Snapshot failed")
-                logger.error("=" * 70)
-                sys.exit(1)
+        if not db_path.exists():
+            logger.error(f"Database not found: {db_path}")
+            sys.exit(1)
+
+        if create_snapshot(str(db_path)):
+            logger.info("=" * 70)
+            logger.info("✓ Snapshot completed successfully")
+            logger.info("=" * 70)
+            sys.exit(0)
+        else:
+            logger.error("=" * 70)
+            logger.error("✗ Snapshot failed")
+            logger.error("=" * 70)
+            sys.exit(1)
 
     except RuntimeError as e:
         logger.warning(str(e))
@@ -0,0 +1,10 @@
+-- Migration 004: Covering index for latest_balances
+-- Lets the MAX(timestamp) GROUP BY (account_id, currency_id) in the latest_balances
+-- view be answered from the index instead of scanning and sorting balances.
+--
+-- Run: sqlite3 data/portfolio.db < sql/migrations/004_add_balances_latest_index.sql
+
+CREATE INDEX IF NOT EXISTS idx_balances_account_currency_timestamp
+    ON balances(account_id, currency_id, timestamp DESC);
+
+ANALYZE balances;
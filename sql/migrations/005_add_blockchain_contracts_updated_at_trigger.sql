@@ -0,0 +1,12 @@
+-- Migration 005: Keep blockchain_contracts.updated_at current
+-- ingest_balances.py caches contract mappings keyed on MAX(updated_at); without
+-- this trigger an in-place edit (decimals, is_active, ...) would not invalidate it.
+--
+-- Run: sqlite3 data/portfolio.db < sql/migrations/005_add_blockchain_contracts_updated_at_trigger.sql
+
+CREATE TRIGGER IF NOT EXISTS blockchain_contracts_updated_at
+AFTER UPDATE ON blockchain_contracts
+FOR EACH ROW
+BEGIN
+    UPDATE blockchain_contracts SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
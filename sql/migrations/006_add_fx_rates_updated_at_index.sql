@@ -0,0 +1,11 @@
+-- Migration 006: Index fx_rates.updated_at
+-- Lets the TTL and stale-rate checks in tradingview.py compare updated_at against
+-- a datetime('now', ...) cutoff through the index instead of computing
+-- julianday() for every row.
+--
+-- Run: sqlite3 data/portfolio.db < sql/migrations/006_add_fx_rates_updated_at_index.sql
+
+CREATE INDEX IF NOT EXISTS idx_fx_rates_updated_at
+    ON fx_rates(updated_at);
+
+ANALYZE fx_rates;
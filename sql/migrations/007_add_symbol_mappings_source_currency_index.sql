@@ -0,0 +1,14 @@
+-- Migration 007: Composite index for TradingView symbol lookups
+-- Lets tradingview.py find the source = 'tradingview' mappings and join them to
+-- currencies from one index. It also covers every lookup the source-only
+-- index served, so that index is dropped. The parent_currency_id index the
+-- same query needs is already created by migration 001.
+--
+-- Run: sqlite3 data/portfolio.db < sql/migrations/007_add_symbol_mappings_source_currency_index.sql
+
+CREATE INDEX IF NOT EXISTS idx_symbol_mappings_source_currency
+    ON symbol_mappings(source, currency_id);
+
+DROP INDEX IF EXISTS idx_symbol_mappings_source;
+
+ANALYZE symbol_mappings;
@@ -103,6 +103,10 @@ CREATE INDEX IF NOT EXISTS idx_balances_timestamp
 CREATE INDEX IF NOT EXISTS idx_balances_account_timestamp
     ON balances(account_id, timestamp);
 
+-- Covers the MAX(timestamp) GROUP BY (account_id, currency_id) in latest_balances
+CREATE INDEX IF NOT EXISTS idx_balances_account_currency_timestamp
+    ON balances(account_id, currency_id, timestamp DESC);
+
 CREATE INDEX IF NOT EXISTS idx_balances_currency
     ON balances(currency_id);
 
@@ -127,12 +131,16 @@ CREATE INDEX IF NOT EXISTS idx_currencies_type
 CREATE INDEX IF NOT EXISTS idx_symbol_mappings_currency
     ON symbol_mappings(currency_id);
 
-CREATE INDEX IF NOT EXISTS idx_symbol_mappings_source
-    ON symbol_mappings(source);
+CREATE INDEX IF NOT EXISTS idx_symbol_mappings_source_currency
+    ON symbol_mappings(source, currency_id);
 
 CREATE INDEX IF NOT EXISTS idx_symbol_mappings_primary
     ON symbol_mappings(currency_id, is_primary) WHERE is_primary = 1;
 
+-- FX rates indexes
+CREATE INDEX IF NOT EXISTS idx_fx_rates_updated_at
+    ON fx_rates(updated_at);
+
 -- ============================================================================
 -- TRIGGERS
 -- ============================================================================
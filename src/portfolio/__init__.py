@@ -9,6 +9,7 @@ __version__ = "0.1.0"
 
 from .tradingview import (
     fetch_and_update_prices,
+    FetchResult,
     check_stale_rates,
     get_tradingview_symbols,
 )
@@ -23,6 +24,7 @@ from .exchanges import (
 
 __all__ = [
     "fetch_and_update_prices",
+    "FetchResult",
     "check_stale_rates",
     "get_tradingview_symbols",
     "create_exchange",
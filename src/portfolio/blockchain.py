@@ -5,14 +5,55 @@ Provides adapters for fetching on-chain balances from EVM-compatible networks.
 Uses Web3.py for RPC interactions with Ethereum, Polygon, BSC, Arbitrum, Optimism, Base.
 """
 
+import json
 import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 
 logger = logging.getLogger(__name__)
 
+# balanceOf(address) function selector
+BALANCE_OF_SELECTOR = "0x70a08231"
+
+# Multicall3 is deployed at the same address on every major EVM chain
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# getEthBalance(address) function selector on Multicall3
+GET_ETH_BALANCE_SELECTOR = "0x4d2301cc"
+
+# decimals() function selector
+DECIMALS_SELECTOR = "0x313ce567"
+
+# symbol(), name() and decimals() function selectors
+METADATA_SELECTORS = ("0x95d89b41", "0x06fdde03", DECIMALS_SELECTOR)
+
+# Max calls per aggregate3 eth_call (keeps each call well under node gas caps)
+MULTICALL_BATCH_SIZE = 500
+
+# Max eth_call entries per JSON-RPC batch (many providers cap batches at 100)
+ERC20_BATCH_SIZE = 100
+
+# Default location of the on-disk ERC-20 metadata cache
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "portfolio" / "tokens.sqlite"
+
+# Bundled token lists (Uniswap token list format), one file per network code
+TOKENLIST_DIR = Path(__file__).parent / "tokenlists"
+
+# Seconds to wait on a single JSON-RPC call (batches get BATCH_TIMEOUT)
+RPC_TIMEOUT = 10
+BATCH_TIMEOUT = 30
+
 # Minimal ERC-20 ABI for balance and metadata queries
 ERC20_ABI = [
     {
@@ -45,8 +86,105 @@ ERC20_ABI = [
     },
 ]
 
+# Minimal Multicall3 ABI (aggregate3 only)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+
+def create_rpc_session(pool_maxsize: int = 16) -> requests.Session:
+    """
+    Create a keep-alive HTTP session for JSON-RPC traffic.
+
+    One session is shared by every network's provider, so repeated calls to an
+    endpoint reuse pooled TLS connections. eth_call and eth_getBalance are
+    read-only, so POSTs are retried on rate limits and transient 5xx errors.
+
+    Args:
+        pool_maxsize: Max pooled connections per host
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None,  # JSON-RPC reads are POSTs
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _address_word(address: str) -> str:
+    """ABI-encode an address argument as a 32-byte hex word (no 0x prefix)."""
+    return address.lower().removeprefix("0x").rjust(64, "0")
+
+
+# rpc_url -> (chain ID, Multicall3 deployed) for endpoints probed this run
+_endpoint_probes: Dict[str, Tuple[int, bool]] = {}
+
+
+@lru_cache(maxsize=4096)
+def _checksum(address: str) -> str:
+    """EIP-55 checksum an address; memoized since each one costs a keccak."""
+    return Web3.to_checksum_address(address)
+
+
+# Powers of ten for every decimals value a uint256 balance can meaningfully use
+_POW10 = tuple(10.0**i for i in range(78))
+
 
-@dataclass
+def _scale(balance_raw: int, decimals: int) -> float:
+    """Convert a raw balance to token units."""
+    if decimals < len(_POW10):
+        return balance_raw / _POW10[decimals]
+    return balance_raw / 10**decimals
+
+
+@lru_cache(maxsize=256)
+def _balance_of_calldata(wallet_address: str) -> bytes:
+    """
+    balanceOf(wallet_address) calldata.
+
+    Only the call target differs between contracts, so this is encoded once
+    per wallet and shared by every contract on every network.
+    """
+    return bytes.fromhex(BALANCE_OF_SELECTOR[2:] + _address_word(wallet_address))
+
+
+@dataclass(slots=True)
 class TokenBalance:
     """Represents a token balance (native or ERC-20)."""
 
@@ -57,7 +195,7 @@ class TokenBalance:
     is_native: bool  # True for ETH, BNB, POL, etc.
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenMetadata:
     """ERC-20 token metadata."""
 
@@ -67,10 +205,122 @@ class TokenMetadata:
     decimals: int
 
 
+@lru_cache(maxsize=None)
+def load_tokenlist(network: str, chain_id: int) -> Dict[str, TokenMetadata]:
+    """
+    Load the bundled token list for a network, keyed by lowercase address.
+
+    Entries for other chain IDs are ignored, so a multi-chain list (such as
+    tokens.uniswap.org) can be dropped in as-is. Missing files give {}.
+
+    Args:
+        network: Network code (ethereum, polygon, bsc, etc.)
+        chain_id: Chain ID the entries must belong to
+
+    Returns:
+        Dict of contract_address -> TokenMetadata
+    """
+    path = TOKENLIST_DIR / f"{network}.json"
+    try:
+        tokens = json.loads(path.read_text())["tokens"]
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable token list {path}: {e}")
+        return {}
+
+    return {
+        token["address"].lower(): TokenMetadata(
+            contract_address=token["address"].lower(),
+            symbol=token["symbol"],
+            name=token["name"],
+            decimals=token["decimals"],
+        )
+        for token in tokens
+        if token.get("chainId", chain_id) == chain_id
+    }
+
+
+class TokenMetadataCache:
+    """
+    On-disk cache of ERC-20 metadata keyed by (chain_id, contract address).
+
+    symbol, name and decimals never change for a deployed contract, so each
+    token only has to be read on-chain the first time it is seen.
+    """
+
+    def __init__(self, path: Path = TOKEN_CACHE_PATH):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite file holding the cache
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Adapters may be used from worker threads; the lock serializes access
+        self.conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS token_metadata (
+                chain_id INTEGER NOT NULL,
+                address  TEXT NOT NULL,
+                symbol   TEXT NOT NULL,
+                name     TEXT NOT NULL,
+                decimals INTEGER NOT NULL,
+                PRIMARY KEY (chain_id, address)
+            ) WITHOUT ROWID
+        """
+        )
+        self.conn.commit()
+
+    def get(self, chain_id: int, contract_address: str) -> Optional[TokenMetadata]:
+        """Return cached metadata, or None on a miss."""
+        address = contract_address.lower()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT symbol, name, decimals FROM token_metadata"
+                " WHERE chain_id = ? AND address = ?",
+                (chain_id, address),
+            ).fetchone()
+        if row is None:
+            return None
+        return TokenMetadata(contract_address=address, symbol=row[0], name=row[1], decimals=row[2])
+
+    def put(self, chain_id: int, metadata: TokenMetadata):
+        """Store metadata fetched on-chain."""
+        with self.lock:
+            self.conn.execute(
+                """
+                INSERT OR REPLACE INTO token_metadata (chain_id, address, symbol, name, decimals)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (
+                    chain_id,
+                    metadata.contract_address.lower(),
+                    metadata.symbol,
+                    metadata.name,
+                    metadata.decimals,
+                ),
+            )
+            self.conn.commit()
+
+    def close(self):
+        """Close the cache database."""
+        self.conn.close()
+
+
 class EVMAdapter:
     """Adapter for EVM-compatible blockchain networks."""
 
-    def __init__(self, rpc_url: str, network: str, chain_id: int):
+    def __init__(
+        self,
+        rpc_url: str,
+        network: str,
+        chain_id: int,
+        session: Optional[requests.Session] = None,
+        metadata_cache: Optional[TokenMetadataCache] = None,
+    ):
         """
         Initialize EVM adapter.
 
@@ -78,25 +328,70 @@ class EVMAdapter:
             rpc_url: RPC endpoint URL (Infura, Alchemy, etc.)
             network: Network code (ethereum, polygon, bsc, etc.)
             chain_id: Expected chain ID for verification
+            session: Shared HTTP session (one is created if omitted)
+            metadata_cache: Token metadata cache consulted before the chain
         """
         self.rpc_url = rpc_url
         self.network = network
         self.expected_chain_id = chain_id
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.metadata_cache = metadata_cache
 
-        # Verify connection
-        if not self.w3.is_connected():
-            raise ConnectionError(f"Failed to connect to {network} at {rpc_url}")
+        # Web3 calls and JSON-RPC batches go through the same keep-alive session
+        self._owns_session = session is None
+        self.session = session or create_rpc_session()
+        self.w3 = Web3(
+            Web3.HTTPProvider(
+                rpc_url, session=self.session, request_kwargs={"timeout": RPC_TIMEOUT}
+            )
+        )
+
+        # Decimals read on-chain for contracts passed in with decimals=None
+        self._decimals_cache: Dict[str, int] = {}
+
+        # Cleared if the endpoint rejects JSON-RPC batches
+        self.erc20_batch_size = ERC20_BATCH_SIZE
+        self.batch_supported = True
+
+        # Set below from the code at MULTICALL3_ADDRESS; cleared if a call fails
+        self.multicall = self.w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+        self.multicall_supported = False
+
+        # Endpoints already probed by an earlier adapter in this process
+        # aren't asked again
+        probed = _endpoint_probes.get(rpc_url)
+        if probed is not None:
+            actual_chain_id, self.multicall_supported = probed
+        else:
+            # One eth_chainId call both proves the endpoint answers and gives
+            # the chain to verify (is_connected() would be a second round trip)
+            try:
+                actual_chain_id = self.w3.eth.chain_id
+            except Exception as e:
+                raise ConnectionError(f"Failed to connect to {network} at {rpc_url}: {e}") from e
 
-        # Verify chain ID
-        actual_chain_id = self.w3.eth.chain_id
         if actual_chain_id != self.expected_chain_id:
             raise ValueError(
                 f"{network}: Chain ID mismatch - expected {self.expected_chain_id}, got {actual_chain_id}"
             )
 
+        if probed is None:
+            # Multicall3 isn't deployed on every chain; check once instead of
+            # letting the first aggregate3 call fail
+            try:
+                self.multicall_supported = len(self.w3.eth.get_code(MULTICALL3_ADDRESS)) > 0
+            except Exception as e:
+                logger.debug(f"{network}: Multicall3 code lookup failed: {e}")
+            _endpoint_probes[rpc_url] = (actual_chain_id, self.multicall_supported)
+        if not self.multicall_supported:
+            logger.info(f"{network}: Multicall3 not deployed, using eth_call")
+
         logger.info(f"Connected to {network} (chain_id: {actual_chain_id})")
 
+    def close(self):
+        """Close the HTTP session if this adapter created it (shared ones are left open)."""
+        if self._owns_session:
+            self.session.close()
+
     def get_native_balance(self, address: str) -> int:
         """
         Get native token balance (ETH, BNB, POL, etc.) in smallest unit (wei).
@@ -107,7 +402,7 @@ class EVMAdapter:
         Returns:
             Balance in wei
         """
-        checksum_address = Web3.to_checksum_address(address)
+        checksum_address = _checksum(address)
         return self.w3.eth.get_balance(checksum_address)
 
     def get_erc20_balance(self, token_address: str, wallet_address: str) -> int:
@@ -120,32 +415,290 @@ class EVMAdapter:
 
         Returns:
             Balance in token's smallest unit
+
+        Raises:
+            ValueError: If the call returns no uint256 (e.g. no contract code)
         """
-        contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(token_address), abi=ERC20_ABI
+        result = self.w3.eth.call(
+            {
+                "to": _checksum(token_address),
+                "data": _balance_of_calldata(wallet_address),
+            }
         )
-        return contract.functions.balanceOf(Web3.to_checksum_address(wallet_address)).call()
+        if len(result) < 32:
+            raise ValueError(f"balanceOf returned {len(result)} bytes from {token_address}")
+        return int.from_bytes(result[:32], "big")
+
+    def get_decimals(self, token_address: str) -> int:
+        """
+        Get an ERC-20 token's decimals, reading the chain only on first use.
+
+        Args:
+            token_address: Token contract address
+
+        Returns:
+            Token decimals
+
+        Raises:
+            ValueError: If the call returns no uint8 (e.g. no contract code)
+        """
+        decimals = self._decimals_cache.get(token_address)
+        if decimals is None:
+            listed = self._tokenlist.get(token_address.lower())
+            if listed is not None:
+                return listed.decimals
+            result = self.w3.eth.call({"to": _checksum(token_address), "data": DECIMALS_SELECTOR})
+            if len(result) < 32:
+                raise ValueError(f"decimals returned {len(result)} bytes from {token_address}")
+            decimals = self._decimals_cache[token_address] = int.from_bytes(result[:32], "big")
+        return decimals
+
+    def _rpc_batch(self, calls: List[Tuple[str, list]]) -> List[Optional[str]]:
+        """
+        Send (method, params) calls as JSON-RPC batches of up to erc20_batch_size.
+
+        Args:
+            calls: JSON-RPC method names and their params
+
+        Returns:
+            Raw hex results in call order, None where that call errored
+
+        Raises:
+            requests.RequestException, ValueError: If the endpoint rejects the batch
+        """
+        results: List[Optional[str]] = [None] * len(calls)
+
+        for start in range(0, len(calls), self.erc20_batch_size):
+            payload = [
+                {"jsonrpc": "2.0", "id": start + i, "method": method, "params": params}
+                for i, (method, params) in enumerate(calls[start : start + self.erc20_batch_size])
+            ]
+
+            response = self.session.post(self.rpc_url, json=payload, timeout=BATCH_TIMEOUT)
+            response.raise_for_status()
+            replies = response.json()
+            if not isinstance(replies, list):
+                raise ValueError(f"{self.network}: endpoint does not support batch requests")
+
+            # Replies may come back in any order; match them up by id
+            for reply in replies:
+                results[reply["id"]] = reply.get("result")
+
+        return results
+
+    def get_erc20_balances_batch(
+        self, contract_addresses: List[str], wallet_address: str
+    ) -> Dict[str, Optional[int]]:
+        """
+        Get ERC-20 balances with one JSON-RPC batch of eth_call per chunk of contracts.
+
+        Args:
+            contract_addresses: Token contract addresses
+            wallet_address: Wallet address to check
+
+        Returns:
+            Dict of contract_address -> balance, None where that call failed
+
+        Raises:
+            requests.RequestException, ValueError: If the endpoint rejects the batch
+        """
+        data = "0x" + _balance_of_calldata(wallet_address).hex()
+        results = self._rpc_batch(
+            [
+                ("eth_call", [{"to": contract_address, "data": data}, "latest"])
+                for contract_address in contract_addresses
+            ]
+        )
+
+        # "0x" means no contract code at that address
+        return {
+            contract_address: int(result, 16) if result and result != "0x" else None
+            for contract_address, result in zip(contract_addresses, results)
+        }
+
+    def get_balances_batch(
+        self, wallet_address: str, contract_addresses: List[str]
+    ) -> Tuple[Optional[int], Dict[str, Optional[int]]]:
+        """
+        Get native and ERC-20 balances through JSON-RPC batches.
+
+        eth_getBalance rides in the first batch with the balanceOf calls, so
+        a wallet with up to erc20_batch_size - 1 tokens costs one round trip.
+
+        Args:
+            wallet_address: Wallet address to check
+            contract_addresses: Token contract addresses
+
+        Returns:
+            Tuple of (native balance, dict of contract_address -> balance), with
+            None wherever the individual call failed
+
+        Raises:
+            requests.RequestException, ValueError: If the endpoint rejects the batch
+        """
+        data = "0x" + _balance_of_calldata(wallet_address).hex()
+        calls = [("eth_getBalance", [_checksum(wallet_address), "latest"])]
+        calls += [
+            ("eth_call", [{"to": contract_address, "data": data}, "latest"])
+            for contract_address in contract_addresses
+        ]
+        results = self._rpc_batch(calls)
+
+        native = int(results[0], 16) if results[0] else None
+        return native, {
+            contract_address: int(result, 16) if result and result != "0x" else None
+            for contract_address, result in zip(contract_addresses, results[1:])
+        }
+
+    def get_balances_multicall(
+        self,
+        wallet_address: str,
+        contract_addresses: List[str],
+        unknown_decimals: Optional[List[str]] = None,
+    ) -> Tuple[Optional[int], Dict[str, Optional[int]]]:
+        """
+        Get native and ERC-20 balances through Multicall3 aggregate3.
+
+        One eth_call covers the native balance (via getEthBalance) and up to
+        MULTICALL_BATCH_SIZE - 1 balanceOf calls. decimals() for contracts
+        in unknown_decimals rides in the same call and lands in the decimals
+        cache, so later scans only ask for balances.
+
+        Args:
+            wallet_address: Wallet address to check
+            contract_addresses: Token contract addresses
+            unknown_decimals: Contracts whose decimals should be read as well
+
+        Returns:
+            Tuple of (native balance, dict of contract_address -> balance), with
+            None wherever the individual call failed
+        """
+        return self.get_wallets_multicall(
+            [wallet_address], contract_addresses, unknown_decimals
+        )[wallet_address]
+
+    def get_wallets_multicall(
+        self,
+        wallet_addresses: List[str],
+        contract_addresses: List[str],
+        unknown_decimals: Optional[List[str]] = None,
+    ) -> Dict[str, Tuple[Optional[int], Dict[str, Optional[int]]]]:
+        """
+        Get native and ERC-20 balances for several wallets in one aggregate3 batch.
+
+        Every (wallet, contract) pair becomes one entry, so all wallets on a
+        network share the same eth_call(s) instead of one round trip each.
+
+        Args:
+            wallet_addresses: Wallet addresses to check
+            contract_addresses: Token contract addresses
+            unknown_decimals: Contracts whose decimals should be read as well
+
+        Returns:
+            Dict of wallet_address -> (native balance, dict of contract_address ->
+            balance), with None wherever the individual call failed
+        """
+        unknown_decimals = unknown_decimals or []
+        targets = [_checksum(contract_address) for contract_address in contract_addresses]
+        calls = []
+        for wallet_address in wallet_addresses:
+            balance_of = _balance_of_calldata(wallet_address)
+            get_eth_balance = bytes.fromhex(GET_ETH_BALANCE_SELECTOR[2:]) + balance_of[4:]
+            calls.append((MULTICALL3_ADDRESS, True, get_eth_balance))
+            calls += [(target, True, balance_of) for target in targets]
+        decimals_call = bytes.fromhex(DECIMALS_SELECTOR[2:])
+        calls += [
+            (_checksum(contract_address), True, decimals_call)
+            for contract_address in unknown_decimals
+        ]
+
+        results = []
+        for start in range(0, len(calls), MULTICALL_BATCH_SIZE):
+            chunk = calls[start : start + MULTICALL_BATCH_SIZE]
+            results.extend(self.multicall.functions.aggregate3(chunk).call())
+
+        values = [
+            int.from_bytes(return_data[:32], "big") if success and len(return_data) >= 32 else None
+            for success, return_data in results
+        ]
+
+        # One native entry then one entry per contract, for each wallet in turn
+        stride = 1 + len(contract_addresses)
+        balances_end = stride * len(wallet_addresses)
+        for contract_address, decimals in zip(unknown_decimals, values[balances_end:]):
+            if decimals is not None:
+                self._decimals_cache[contract_address] = decimals
+        return {
+            wallet_address: (
+                values[i * stride],
+                dict(zip(contract_addresses, values[i * stride + 1 : (i + 1) * stride])),
+            )
+            for i, wallet_address in enumerate(wallet_addresses)
+        }
+
+    @property
+    def _tokenlist(self) -> Dict[str, TokenMetadata]:
+        """This network's bundled token list (loaded on first use)."""
+        return load_tokenlist(self.network, self.expected_chain_id)
 
     def get_token_metadata(self, token_address: str) -> Optional[TokenMetadata]:
         """
         Fetch ERC-20 token metadata (symbol, name, decimals).
 
+        The bundled token list is checked first, then the metadata cache;
+        the chain is only read for tokens in neither.
+
         Args:
             token_address: Token contract address
 
         Returns:
             TokenMetadata or None if failed
         """
+        listed = self._tokenlist.get(token_address.lower())
+        if listed is not None:
+            return listed
+
+        if self.metadata_cache is not None:
+            try:
+                cached = self.metadata_cache.get(self.expected_chain_id, token_address)
+                if cached is not None:
+                    return cached
+            except sqlite3.Error as e:
+                logger.debug(f"Token metadata cache read failed: {e}")
+
         try:
-            contract = self.w3.eth.contract(
-                address=Web3.to_checksum_address(token_address), abi=ERC20_ABI
-            )
+            # The three reads are independent; send them as one JSON-RPC batch,
+            # else as plain eth_calls. Selectors go out raw and only the replies
+            # pass through the ABI codec
+            results = None
+            if self.batch_supported:
+                try:
+                    replies = self._rpc_batch(
+                        [
+                            ("eth_call", [{"to": token_address, "data": selector}, "latest"])
+                            for selector in METADATA_SELECTORS
+                        ]
+                    )
+                    results = [bytes.fromhex(reply[2:]) if reply else b"" for reply in replies]
+                except Exception as e:
+                    logger.warning(
+                        f"    {self.network}: batch eth_call failed ({e}), using per-call requests"
+                    )
+                    self.batch_supported = False
+
+            if results is None:
+                checksum_address = _checksum(token_address)
+                results = [
+                    bytes(self.w3.eth.call({"to": checksum_address, "data": selector}))
+                    for selector in METADATA_SELECTORS
+                ]
 
-            symbol = contract.functions.symbol().call()
-            name = contract.functions.name().call()
-            decimals = contract.functions.decimals().call()
+            if not all(len(result) >= 32 for result in results):
+                raise ValueError("metadata call reverted or returned nothing")
+            symbol, name = (self.w3.codec.decode(["string"], result)[0] for result in results[:2])
+            decimals = int.from_bytes(results[2][:32], "big")
 
-            return TokenMetadata(
+            metadata = TokenMetadata(
                 contract_address=token_address.lower(),
                 symbol=symbol,
                 name=name,
@@ -155,27 +708,68 @@ class EVMAdapter:
             logger.debug(f"Failed to fetch metadata for {token_address}: {e}")
             return None
 
+        if self.metadata_cache is not None:
+            try:
+                self.metadata_cache.put(self.expected_chain_id, metadata)
+            except sqlite3.Error as e:
+                logger.debug(f"Token metadata cache write failed: {e}")
+
+        return metadata
+
     def discover_erc20_tokens(
-        self, wallet_address: str, known_contracts: Dict[str, int]
+        self,
+        wallet_address: str,
+        known_contracts: Dict[str, Optional[int]],
+        batch_results: Optional[Dict[str, Optional[int]]] = None,
     ) -> List[TokenBalance]:
         """
         Discover ERC-20 token balances from known contract addresses.
 
         Args:
             wallet_address: Wallet to check
-            known_contracts: Dict of contract_address -> decimals
+            known_contracts: Dict of contract_address -> decimals (None if unknown)
+            batch_results: Balances already fetched (e.g. via Multicall3)
 
         Returns:
             List of TokenBalance objects with non-zero balances
         """
         balances = []
 
+        # One round trip for all contracts: a single Multicall3 aggregate3 call,
+        # else a JSON-RPC batch. Anything missing is retried below with a plain
+        # eth_call
+        if batch_results is None and self.multicall_supported:
+            try:
+                _, batch_results = self.get_balances_multicall(
+                    wallet_address, list(known_contracts), self._missing_decimals(known_contracts)
+                )
+            except Exception as e:
+                logger.warning(f"    {self.network}: Multicall3 unavailable ({e}), using eth_call")
+                self.multicall_supported = False
+
+        if batch_results is None:
+            batch_results = {}
+            if self.batch_supported:
+                try:
+                    batch_results = self.get_erc20_balances_batch(
+                        list(known_contracts), wallet_address
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"    {self.network}: batch eth_call failed ({e}), using per-contract calls"
+                    )
+                    self.batch_supported = False
+
         for contract_address, decimals in known_contracts.items():
             try:
-                balance_raw = self.get_erc20_balance(contract_address, wallet_address)
+                balance_raw = batch_results.get(contract_address)
+                if balance_raw is None:
+                    balance_raw = self.get_erc20_balance(contract_address, wallet_address)
 
                 if balance_raw > 0:
-                    balance = balance_raw / (10**decimals)
+                    if decimals is None:
+                        decimals = self.get_decimals(contract_address)
+                    balance = _scale(balance_raw, decimals)
                     balances.append(
                         TokenBalance(
                             contract_address=contract_address.lower(),
@@ -185,18 +779,29 @@ class EVMAdapter:
                             is_native=False,
                         )
                     )
-                    logger.info(f"    {contract_address[:10]}...: {balance:.6f}")
+                    logger.debug("    %s...: %.6f", contract_address[:10], balance)
             except Exception as e:
-                logger.debug(f"    Error checking {contract_address}: {e}")
+                logger.debug("    Error checking %s: %s", contract_address, e)
                 continue
 
         return balances
 
+    def _missing_decimals(self, known_contracts: Dict[str, Optional[int]]) -> List[str]:
+        """Contracts passed in without decimals that no list or cache knows yet."""
+        return [
+            contract_address
+            for contract_address, decimals in known_contracts.items()
+            if decimals is None
+            and contract_address not in self._decimals_cache
+            and contract_address.lower() not in self._tokenlist
+        ]
+
     def fetch_balances(
         self,
         wallet_address: str,
         native_decimals: int,
-        known_erc20_contracts: Dict[str, int],
+        known_erc20_contracts: Dict[str, Optional[int]],
+        prefetched: Optional[Tuple[Optional[int], Dict[str, Optional[int]]]] = None,
     ) -> List[TokenBalance]:
         """
         Fetch all balances (native + ERC-20) for a wallet.
@@ -204,18 +809,45 @@ class EVMAdapter:
         Args:
             wallet_address: Wallet address to scan
             native_decimals: Native token decimals (usually 18)
-            known_erc20_contracts: Dict of contract_address -> decimals
+            known_erc20_contracts: Dict of contract_address -> decimals (None if unknown)
+            prefetched: (native, ERC-20) raw balances already fetched for this wallet
 
         Returns:
             List of TokenBalance objects
         """
         balances = []
 
+        # Native + all ERC-20 balances in a single eth_call where Multicall3 exists
+        native_balance_raw, erc20_results = prefetched or (None, None)
+        if erc20_results is None and self.multicall_supported:
+            try:
+                native_balance_raw, erc20_results = self.get_balances_multicall(
+                    wallet_address,
+                    list(known_erc20_contracts),
+                    self._missing_decimals(known_erc20_contracts),
+                )
+            except Exception as e:
+                logger.warning(f"    {self.network}: Multicall3 unavailable ({e}), using eth_call")
+                self.multicall_supported = False
+
+        # Otherwise one JSON-RPC batch carries the native and ERC-20 calls
+        if erc20_results is None and self.batch_supported:
+            try:
+                native_balance_raw, erc20_results = self.get_balances_batch(
+                    wallet_address, list(known_erc20_contracts)
+                )
+            except Exception as e:
+                logger.warning(
+                    f"    {self.network}: batch eth_call failed ({e}), using per-contract calls"
+                )
+                self.batch_supported = False
+
         # Get native token balance
         try:
-            native_balance_raw = self.get_native_balance(wallet_address)
+            if native_balance_raw is None:
+                native_balance_raw = self.get_native_balance(wallet_address)
             if native_balance_raw > 0:
-                native_balance = native_balance_raw / (10**native_decimals)
+                native_balance = _scale(native_balance_raw, native_decimals)
                 balances.append(
                     TokenBalance(
                         contract_address=None,
@@ -225,44 +857,118 @@ class EVMAdapter:
                         is_native=True,
                     )
                 )
-                logger.info(f"    Native token: {native_balance:.6f}")
+                logger.debug("    Native token: %.6f", native_balance)
         except Exception as e:
             logger.error(f"  Failed to fetch native balance: {e}")
 
         # Get ERC-20 token balances
         if known_erc20_contracts:
-            logger.info(f"    Checking {len(known_erc20_contracts)} ERC-20 contracts...")
-            erc20_balances = self.discover_erc20_tokens(wallet_address, known_erc20_contracts)
+            logger.debug("    Checking %d ERC-20 contracts...", len(known_erc20_contracts))
+            erc20_balances = self.discover_erc20_tokens(
+                wallet_address, known_erc20_contracts, erc20_results
+            )
             balances.extend(erc20_balances)
 
         return balances
 
+    def fetch_wallets_balances(
+        self,
+        wallet_addresses: List[str],
+        native_decimals: int,
+        known_erc20_contracts: Dict[str, Optional[int]],
+    ) -> Dict[str, List[TokenBalance]]:
+        """
+        Fetch all balances for several wallets on this network.
+
+        Where Multicall3 exists, every wallet's native and ERC-20 balances go
+        out in one aggregate3 batch; anything it misses falls back to the
+        per-wallet paths of fetch_balances().
+
+        Args:
+            wallet_addresses: Wallet addresses to scan
+            native_decimals: Native token decimals (usually 18)
+            known_erc20_contracts: Dict of contract_address -> decimals (None if unknown)
+
+        Returns:
+            Dict of wallet_address -> list of TokenBalance
+        """
+        prefetched = {}
+        if self.multicall_supported and len(wallet_addresses) > 1:
+            try:
+                prefetched = self.get_wallets_multicall(
+                    wallet_addresses,
+                    list(known_erc20_contracts),
+                    self._missing_decimals(known_erc20_contracts),
+                )
+            except Exception as e:
+                logger.warning(f"    {self.network}: Multicall3 unavailable ({e}), using eth_call")
+                self.multicall_supported = False
+
+        return {
+            wallet_address: self.fetch_balances(
+                wallet_address,
+                native_decimals,
+                known_erc20_contracts,
+                prefetched.get(wallet_address),
+            )
+            for wallet_address in wallet_addresses
+        }
+
 
 class MultiChainAdapter:
     """Multi-chain adapter for fetching balances across multiple EVM networks."""
 
-    def __init__(self, network_configs: Dict[str, Dict]):
+    def __init__(
+        self, network_configs: Dict[str, Dict], session: Optional[requests.Session] = None
+    ):
         """
         Initialize multi-chain adapter.
 
         Args:
             network_configs: Dict of network -> {rpc_url, chain_id}
+            session: HTTP session shared by all networks (one is created if omitted)
         """
+        self._owns_session = session is None
+        self.session = session or create_rpc_session()
         self.adapters = {}
-        for network, config in network_configs.items():
-            try:
-                self.adapters[network] = EVMAdapter(
+        if not network_configs:
+            return
+
+        # Each adapter probes its endpoint (connection, chain ID, Multicall3)
+        # on construction; probe all networks at once instead of one by one
+        with ThreadPoolExecutor(max_workers=len(network_configs)) as pool:
+            futures = {
+                network: pool.submit(
+                    EVMAdapter,
                     rpc_url=config["rpc_url"],
                     network=network,
                     chain_id=config["chain_id"],
+                    session=self.session,
                 )
+                for network, config in network_configs.items()
+            }
+
+        for network, future in futures.items():
+            try:
+                self.adapters[network] = future.result()
             except Exception as e:
                 logger.error(f"Failed to initialize {network} adapter: {e}")
 
+    def close(self):
+        """Close the pooled HTTP connections if this adapter created the session."""
+        if self._owns_session:
+            self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def fetch_wallet_balances(
         self,
         wallet_addresses: Dict[str, str],
-        known_contracts: Dict[str, Dict[str, int]],
+        known_contracts: Dict[str, Dict[str, Optional[int]]],
         native_decimals: Dict[str, int],
     ) -> Dict[str, List[TokenBalance]]:
         """
@@ -270,34 +976,125 @@ class MultiChainAdapter:
 
         Args:
             wallet_addresses: Dict of network -> wallet_address
-            known_contracts: Dict of network -> dict of {contract_address: decimals}
+            known_contracts: Dict of network -> dict of {contract_address: decimals or None}
             native_decimals: Dict of network -> native_token_decimals
 
         Returns:
             Dict of network -> list of TokenBalance
         """
-        all_balances = {}
+        return self.fetch_accounts_balances(
+            {None: wallet_addresses}, known_contracts, native_decimals
+        ).get(None, {})
 
-        for network, address in wallet_addresses.items():
-            if network not in self.adapters:
-                logger.warning(f"No adapter for {network}, skipping")
-                continue
+    def fetch_accounts_balances(
+        self,
+        accounts: Dict[Hashable, Dict[str, str]],
+        known_contracts: Dict[str, Dict[str, Optional[int]]],
+        native_decimals: Dict[str, int],
+    ) -> Dict[Hashable, Dict[str, List[TokenBalance]]]:
+        """
+        Fetch balances for many accounts, one scan per network.
 
-            logger.info(f"  Fetching from {network} ({address[:10]}...)")
-            adapter = self.adapters[network]
-            native_dec = native_decimals.get(network, 18)
-            contracts = known_contracts.get(network, {})
+        Wallets are grouped by network and an address shared by several
+        accounts is only scanned once, so each network's contracts are
+        checked for all of its wallets together.
 
-            try:
-                balances = adapter.fetch_balances(
-                    wallet_address=address,
-                    native_decimals=native_dec,
-                    known_erc20_contracts=contracts,
-                )
-                all_balances[network] = balances
-                logger.info(f"  ✓ {network}: Found {len(balances)} tokens")
-            except Exception as e:
-                logger.error(f"  ✗ {network}: Failed to fetch balances - {e}")
-                all_balances[network] = []
+        Args:
+            accounts: Dict of account key -> {network: wallet_address}
+            known_contracts: Dict of network -> dict of {contract_address: decimals or None}
+            native_decimals: Dict of network -> native_token_decimals
+
+        Returns:
+            Dict of account key -> {network: list of TokenBalance}
+        """
+        results = {}
+        for network, balances in self.iter_network_balances(
+            accounts, known_contracts, native_decimals
+        ):
+            results[network] = balances
+            logger.info(f"  {network}: done ({len(results)} network(s) finished so far)")
+
+        # Hand each account its wallets' balances, in config order
+        return {
+            key: {
+                network: results[network].get(address.lower(), [])
+                for network, address in addresses.items()
+                if network in results
+            }
+            for key, addresses in accounts.items()
+        }
+
+    def iter_network_balances(
+        self,
+        accounts: Dict[Hashable, Dict[str, str]],
+        known_contracts: Dict[str, Dict[str, Optional[int]]],
+        native_decimals: Dict[str, int],
+    ) -> Iterator[Tuple[str, Dict[str, List[TokenBalance]]]]:
+        """
+        Scan every network concurrently, yielding each one as soon as it finishes.
 
-        return all_balances
+        A slow endpoint doesn't hold back results from the others, so callers
+        can report partial progress while it is still running.
+
+        Args:
+            accounts: Dict of account key -> {network: wallet_address}
+            known_contracts: Dict of network -> dict of {contract_address: decimals or None}
+            native_decimals: Dict of network -> native_token_decimals
+
+        Yields:
+            (network, dict of lowercase wallet_address -> list of TokenBalance)
+        """
+        # network -> {lowercase address: address as configured}
+        wallets_by_network: Dict[str, Dict[str, str]] = {}
+        for addresses in accounts.values():
+            for network, address in addresses.items():
+                if network in self.adapters:
+                    wallets_by_network.setdefault(network, {}).setdefault(address.lower(), address)
+                else:
+                    logger.warning(f"No adapter for {network}, skipping")
+        if not wallets_by_network:
+            return
+
+        # Each network is a separate endpoint, so fetch them side by side
+        with ThreadPoolExecutor(max_workers=len(wallets_by_network)) as pool:
+            futures = {
+                pool.submit(
+                    self._fetch_network,
+                    network,
+                    list(wallets.values()),
+                    known_contracts.get(network, {}),
+                    native_decimals.get(network, 18),
+                ): network
+                for network, wallets in wallets_by_network.items()
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def _fetch_network(
+        self,
+        network: str,
+        addresses: List[str],
+        contracts: Dict[str, Optional[int]],
+        native_dec: int,
+    ) -> Dict[str, List[TokenBalance]]:
+        """Fetch one network's wallets, logging failures instead of raising."""
+        logger.info("  Fetching %d wallet(s) from %s", len(addresses), network)
+        started = time.perf_counter()
+        try:
+            balances = self.adapters[network].fetch_wallets_balances(
+                wallet_addresses=addresses,
+                native_decimals=native_dec,
+                known_erc20_contracts=contracts,
+            )
+            for address, wallet_balances in balances.items():
+                logger.debug("  %s (%s...): %d tokens", network, address[:10], len(wallet_balances))
+            logger.info(
+                "  ✓ %s: Found %d tokens in %.2fs",
+                network,
+                sum(len(wallet_balances) for wallet_balances in balances.values()),
+                time.perf_counter() - started,
+            )
+            return {address.lower(): found for address, found in balances.items()}
+        except Exception as e:
+            logger.error(f"  ✗ {network}: Failed to fetch balances - {e}")
+            return {}
@@ -5,16 +5,37 @@ Provides adapters for fetching balances from various crypto exchanges.
 Uses CCXT library for unified exchange API access.
 """
 
+import hashlib
+import json
 import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, DefaultDict, Dict, List, Optional
 
 import ccxt
+import requests
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Milliseconds ccxt waits on a single exchange request
+REQUEST_TIMEOUT_MS = 10000
 
-@dataclass
+# Earn/staking endpoints the account can't use are skipped until this many seconds pass
+ENDPOINT_CACHE_TTL = 24 * 3600
+ENDPOINT_CACHE_PATH = Path.home() / ".cache" / "portfolio" / "okx_endpoints.json"
+
+# Errors meaning an endpoint is unavailable to the account, not just failing right now
+UNAVAILABLE_ERRORS = (ccxt.PermissionDenied, ccxt.NotSupported)
+
+
+@dataclass(slots=True)
 class Balance:
     """Represents a currency balance on an exchange."""
 
@@ -24,6 +45,96 @@ class Balance:
     used: float  # Locked balance (in orders)
 
 
+# {currency: [total, free, used]}
+Amounts = DefaultDict[str, List[float]]
+
+
+def _new_amounts() -> Amounts:
+    """Empty per-currency totals; unseen currencies start at zero."""
+    return defaultdict(lambda: [0.0, 0.0, 0.0])
+
+
+def _add_amount(
+    aggregated: Amounts, currency: str, total: float, free: float = 0, used: float = 0
+) -> None:
+    """Add one position to the per-currency totals."""
+    agg = aggregated[currency]
+    agg[0] += total
+    agg[1] += free
+    agg[2] += used
+
+
+def _merge_balance_dict(aggregated: Amounts, balance_data: Dict) -> Amounts:
+    """Add the non-zero currencies of a ccxt fetch_balance() result."""
+    free = balance_data["free"]
+    used = balance_data["used"]
+    for currency, total in balance_data.get("total", {}).items():
+        if total and total > 0:
+            agg = aggregated[currency]
+            agg[0] += total
+            agg[1] += free.get(currency, 0)
+            agg[2] += used.get(currency, 0)
+    return aggregated
+
+
+def _account_amounts(balance_data: Dict) -> Amounts:
+    """Non-zero currencies from a ccxt fetch_balance() result."""
+    return _merge_balance_dict(_new_amounts(), balance_data)
+
+
+@lru_cache(maxsize=None)
+def _shared_session() -> requests.Session:
+    """
+    Keep-alive HTTP session shared by every exchange client in the process.
+
+    Each adapter fires its account-type requests concurrently, so the pool
+    holds enough connections per host for all of them to reuse a TLS session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+    session.mount("https://", adapter)
+    return session
+
+
+def _load_endpoint_cache() -> Dict:
+    """Read the endpoint availability cache ({} if missing or unreadable)."""
+    try:
+        return json.loads(ENDPOINT_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_endpoint_cache(cache: Dict):
+    """Write the endpoint availability cache atomically."""
+    try:
+        ENDPOINT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ENDPOINT_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(cache))
+        os.replace(tmp_path, ENDPOINT_CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"Could not write endpoint cache: {e}")
+
+
+def _serialize_throttle(exchange) -> None:
+    """
+    Make ccxt's rate limiter safe to share between threads.
+
+    The sync throttle compares against lastRestRequestTimestamp without a
+    lock, so concurrent requests would all see the same timestamp and skip
+    the wait. Holding a lock across the wait and the timestamp update spaces
+    them out as enableRateLimit intends.
+    """
+    lock = threading.Lock()
+    throttle = exchange.throttle
+
+    def locked_throttle(*args, **kwargs):
+        with lock:
+            throttle(*args, **kwargs)
+            exchange.lastRestRequestTimestamp = exchange.milliseconds()
+
+    exchange.throttle = locked_throttle
+
+
 class ExchangeAdapter:
     """Base class for exchange adapters."""
 
@@ -31,6 +142,7 @@ class ExchangeAdapter:
         self.api_key = api_key
         self.api_secret = api_secret
         self.exchange = None
+        self._throttle_serialized = False
 
     def fetch_balances(self) -> List[Balance]:
         """
@@ -41,6 +153,37 @@ class ExchangeAdapter:
         """
         raise NotImplementedError
 
+    def _fetch_concurrently(self, fetchers: List[Callable[[], Amounts]]) -> List[Balance]:
+        """
+        Run independent account fetchers side by side and sum their amounts.
+
+        Each fetcher is its own HTTPS round trip(s) and handles its own
+        errors. Results are merged on this thread in fetcher order, so the
+        totals don't depend on which request finished first.
+        """
+        if not self._throttle_serialized:
+            _serialize_throttle(self.exchange)
+            self._throttle_serialized = True
+
+        # fetch_balance() loads markets on first use; do it once here rather
+        # than letting every worker download the market list in parallel
+        try:
+            self.exchange.load_markets()
+        except Exception as e:
+            logger.debug(f"Could not preload markets: {e}")
+
+        aggregated = _new_amounts()
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as pool:
+            for amounts in pool.map(lambda fetch: fetch(), fetchers):
+                for currency, values in amounts.items():
+                    _add_amount(aggregated, currency, *values)
+
+        # Convert aggregated dict to Balance objects
+        return [
+            Balance(currency=currency, total=total, free=free, used=used)
+            for currency, (total, free, used) in aggregated.items()
+        ]
+
     def test_connection(self) -> bool:
         """Test if API credentials are valid."""
         try:
@@ -62,6 +205,8 @@ class BinanceAdapter(ExchangeAdapter):
                 "apiKey": api_key,
                 "secret": api_secret,
                 "enableRateLimit": True,
+                "session": _shared_session(),
+                "timeout": REQUEST_TIMEOUT_MS,
                 "options": {
                     "defaultType": "spot",  # spot, margin, future
                 },
@@ -73,95 +218,77 @@ class BinanceAdapter(ExchangeAdapter):
 
     def fetch_balances(self) -> List[Balance]:
         """Fetch Binance balances from all account types (spot, margin, future, funding, earn)."""
-        aggregated = {}  # {currency: {'total': x, 'free': y, 'used': z}}
+        # Standard account types plus both Simple Earn endpoints, fetched concurrently
+        fetchers = [
+            lambda account_type=account_type: self._fetch_account(account_type)
+            for account_type in ["spot", "margin", "future", "funding"]
+        ]
+        fetchers += [self._fetch_earn_flexible, self._fetch_earn_locked]
 
-        # Fetch from standard account types
-        account_types = ["spot", "margin", "future", "funding"]
-        for account_type in account_types:
-            try:
-                self.exchange.options["defaultType"] = account_type
-                balance_data = self.exchange.fetch_balance()
+        balances = self._fetch_concurrently(fetchers)
 
-                fetched_count = 0
-                for currency, amounts in balance_data.get("total", {}).items():
-                    if amounts and amounts > 0:
-                        if currency not in aggregated:
-                            aggregated[currency] = {"total": 0, "free": 0, "used": 0}
+        logger.info(f"Binance total: {len(balances)} currencies across all accounts")
+        return balances
 
-                        aggregated[currency]["total"] += amounts
-                        aggregated[currency]["free"] += balance_data["free"].get(currency, 0)
-                        aggregated[currency]["used"] += balance_data["used"].get(currency, 0)
-                        fetched_count += 1
+    def _fetch_account(self, account_type: str) -> Amounts:
+        """Fetch one standard account type (spot, margin, future, funding)."""
+        try:
+            # Pass the type per request; options["defaultType"] is shared by all threads
+            amounts = _account_amounts(self.exchange.fetch_balance(params={"type": account_type}))
 
-                if fetched_count > 0:
-                    logger.info(f"  Binance {account_type}: {fetched_count} currencies")
+            if amounts:
+                logger.info(f"  Binance {account_type}: {len(amounts)} currencies")
+            return amounts
 
-            except Exception as e:
-                logger.debug(f"  Binance {account_type}: Not accessible or empty ({e})")
-                continue
+        except Exception as e:
+            logger.debug(f"  Binance {account_type}: Not accessible or empty ({e})")
+            return {}
 
-        # Fetch from Simple Earn (Flexible Savings)
+    def _fetch_earn_flexible(self) -> Amounts:
+        """Fetch Simple Earn (Flexible Savings) positions."""
+        amounts = _new_amounts()
         try:
             earn_positions = self.exchange.sapi_get_simple_earn_flexible_position({'size': 100})
-            logger.info(f"Fetched Binance earn (flexible) positions {earn_positions}")
-            earn_count = 0
+            logger.debug("Fetched Binance earn (flexible) positions %s", earn_positions)
             if "rows" in earn_positions:
                 for position in earn_positions["rows"]:
                     currency = position.get("asset")
-                    logger.info(f"Earn position: {currency}")
+                    logger.debug("Earn position: %s", currency)
                     # totalAmount includes both free and locked
                     amount = float(position.get("totalAmount", 0))
 
                     if amount > 0:
-                        if currency not in aggregated:
-                            aggregated[currency] = {"total": 0, "free": 0, "used": 0}
-
-                        aggregated[currency]["total"] += amount
-                        aggregated[currency]["free"] += amount  # Flexible is available
-                        earn_count += 1
+                        _add_amount(amounts, currency, amount, free=amount)  # Flexible is available
 
-            if earn_count > 0:
-                logger.info(f"  Binance earn (flexible): {earn_count} currencies")
+            if amounts:
+                logger.info(f"  Binance earn (flexible): {len(amounts)} currencies")
 
         except Exception as e:
             logger.debug(f"  Binance earn (flexible): Not accessible ({e})")
 
-        # Fetch from Simple Earn (Locked Savings)
+        return amounts
+
+    def _fetch_earn_locked(self) -> Amounts:
+        """Fetch Simple Earn (Locked Savings) positions."""
+        amounts = _new_amounts()
         try:
             locked_positions = self.exchange.sapi_get_simple_earn_locked_position()
-            locked_count = 0
             if "rows" in locked_positions:
                 for position in locked_positions["rows"]:
                     currency = position.get("asset")
                     amount = float(position.get("amount", 0))
 
                     if amount > 0:
-                        if currency not in aggregated:
-                            aggregated[currency] = {"total": 0, "free": 0, "used": 0}
-
-                        aggregated[currency]["total"] += amount
-                        aggregated[currency]["used"] += amount  # Locked is not available
-                        locked_count += 1
+                        # Locked is not available
+                        _add_amount(amounts, currency, amount, used=amount)
 
-            if locked_count > 0:
-                logger.info(f"  Binance earn (locked): {locked_count} currencies")
+            if amounts:
+                logger.info(f"  Binance earn (locked): {len(amounts)} currencies")
 
         except Exception as e:
             logger.debug(f"  Binance earn (locked): Not accessible ({e})")
 
-        # Convert aggregated dict to Balance objects
-        balances = [
-            Balance(
-                currency=currency,
-                total=amounts["total"],
-                free=amounts["free"],
-                used=amounts["used"],
-            )
-            for currency, amounts in aggregated.items()
-        ]
-
-        logger.info(f"Binance total: {len(balances)} currencies across all accounts")
-        return balances
+        return amounts
 
 
 class OKXAdapter(ExchangeAdapter):
@@ -177,67 +304,97 @@ class OKXAdapter(ExchangeAdapter):
                 "secret": api_secret,
                 "password": password,
                 "enableRateLimit": True,
+                "session": _shared_session(),
+                "timeout": REQUEST_TIMEOUT_MS,
             }
         )
 
         if testnet:
             self.exchange.set_sandbox_mode(True)
 
+        # Identifies this account in the endpoint cache without storing the key
+        self._cache_key = hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+        # Optional endpoints this account can't use, found during this fetch
+        self._unavailable_endpoints = set()
+
     def fetch_balances(self) -> List[Balance]:
         """Fetch OKX balances from all account types (trading, funding, earn)."""
-        aggregated = {}  # {currency: {'total': x, 'free': y, 'used': z}}
+        # Earn/staking endpoints that were unavailable (missing, or refused
+        # for permission/support reasons) on the last full scan are skipped
+        # until that scan is ENDPOINT_CACHE_TTL old. Endpoints that answered,
+        # even with no positions, are always queried so new funds show up
+        cache = _load_endpoint_cache()
+        entry = cache.get(self._cache_key)
+        fresh = entry is not None and time.time() - entry["checked_at"] < ENDPOINT_CACHE_TTL
+        skip = set(entry.get("unavailable", [])) if fresh else set()
+        if skip:
+            logger.debug(f"  OKX: skipping endpoints unavailable on last scan: {sorted(skip)}")
+
+        optional = {
+            "earn": self._fetch_earn,
+            "staking": self._fetch_staking,
+            "eth_staking": self._fetch_eth_staking,
+        }
+        self._unavailable_endpoints = set()
+        balances = self._fetch_concurrently(
+            [self._fetch_accounts]
+            + [fetch for name, fetch in optional.items() if name not in skip]
+        )
 
-        # Try unified balance first (returns all accounts)
-        try:
-            balance_data = self.exchange.fetch_balance()
+        if not fresh:
+            cache[self._cache_key] = {
+                "checked_at": time.time(),
+                "unavailable": sorted(self._unavailable_endpoints),
+            }
+            _save_endpoint_cache(cache)
 
-            fetched_count = 0
-            for currency, amounts in balance_data.get("total", {}).items():
-                if amounts and amounts > 0:
-                    if currency not in aggregated:
-                        aggregated[currency] = {"total": 0, "free": 0, "used": 0}
+        logger.info(f"OKX total: {len(balances)} currencies across all accounts")
+        return balances
 
-                    aggregated[currency]["total"] += amounts
-                    aggregated[currency]["free"] += balance_data["free"].get(currency, 0)
-                    aggregated[currency]["used"] += balance_data["used"].get(currency, 0)
-                    fetched_count += 1
+    def _fetch_accounts(self) -> Amounts:
+        """Fetch trading/funding balances, unified first."""
+        # Try unified balance first (returns all accounts)
+        try:
+            amounts = _account_amounts(self.exchange.fetch_balance())
 
-            if fetched_count > 0:
-                logger.info(f"  OKX unified: {fetched_count} currencies")
+            if amounts:
+                logger.info(f"  OKX unified: {len(amounts)} currencies")
+            return amounts
 
         except Exception as e:
             logger.debug(f"  OKX unified balance failed, trying individual accounts: {e}")
 
-            # Fallback: Try individual account types
-            account_types = ["trading", "funding"]
-            for account_type in account_types:
-                try:
-                    balance_data = self.exchange.fetch_balance({"type": account_type})
-
-                    fetched_count = 0
-                    for currency, amounts in balance_data.get("total", {}).items():
-                        if amounts and amounts > 0:
-                            if currency not in aggregated:
-                                aggregated[currency] = {"total": 0, "free": 0, "used": 0}
+        # Fallback: Try individual account types
+        amounts = _new_amounts()
+        account_types = ["trading", "funding"]
+        for account_type in account_types:
+            try:
+                account = _account_amounts(
+                    self.exchange.fetch_balance(params={"type": account_type})
+                )
+                for currency, values in account.items():
+                    _add_amount(amounts, currency, *values)
 
-                            aggregated[currency]["total"] += amounts
-                            aggregated[currency]["free"] += balance_data["free"].get(currency, 0)
-                            aggregated[currency]["used"] += balance_data["used"].get(currency, 0)
-                            fetched_count += 1
+                if account:
+                    logger.info(f"  OKX {account_type}: {len(account)} currencies")
 
-                    if fetched_count > 0:
-                        logger.info(f"  OKX {account_type}: {fetched_count} currencies")
+            except Exception as e:
+                logger.debug(f"  OKX {account_type}: Not accessible or empty ({e})")
+                continue
 
-                except Exception as e:
-                    logger.debug(f"  OKX {account_type}: Not accessible or empty ({e})")
-                    continue
+        return amounts
 
-        # Fetch from Earn (savings products)
+    def _fetch_earn(self) -> Amounts:
+        """Fetch Earn (savings products)."""
+        amounts = _new_amounts()
         try:
             # OKX savings are typically shown in the funding account
             # But we can also try the private API for earn products
+            if not hasattr(self.exchange, "private_get_finance_savings_balance"):
+                self._unavailable_endpoints.add("earn")
+                return amounts
+
             earn_data = self.exchange.private_get_finance_savings_balance()
-            earn_count = 0
 
             if "data" in earn_data:
                 for position in earn_data["data"]:
@@ -245,20 +402,23 @@ class OKXAdapter(ExchangeAdapter):
                     amount = float(position.get("amt", 0))
 
                     if amount > 0:
-                        if currency not in aggregated:
-                            aggregated[currency] = {"total": 0, "free": 0, "used": 0}
-
-                        aggregated[currency]["total"] += amount
-                        aggregated[currency]["used"] += amount  # Earn products are locked
-                        earn_count += 1
+                        # Earn products are locked
+                        _add_amount(amounts, currency, amount, used=amount)
 
-            if earn_count > 0:
-                logger.info(f"  OKX earn: {earn_count} currencies")
+            if amounts:
+                logger.info(f"  OKX earn: {len(amounts)} currencies")
 
+        except UNAVAILABLE_ERRORS as e:
+            self._unavailable_endpoints.add("earn")
+            logger.debug(f"  OKX earn: Not accessible ({e})")
         except Exception as e:
             logger.debug(f"  OKX earn: Not accessible ({e})")
 
-        # Fetch from Staking - get ACTIVE positions (not offers)
+        return amounts
+
+    def _fetch_staking(self) -> Amounts:
+        """Fetch ACTIVE staking positions (not offers)."""
+        amounts = _new_amounts()
         staking_count = 0
 
         try:
@@ -276,16 +436,27 @@ class OKXAdapter(ExchangeAdapter):
                                 amount = float(invest.get("amt", 0))
 
                                 if amount > 0 and currency:
-                                    if currency not in aggregated:
-                                        aggregated[currency] = {"total": 0, "free": 0, "used": 0}
-
-                                    aggregated[currency]["total"] += amount
-                                    aggregated[currency]["used"] += amount  # Staked funds are locked
+                                    # Staked funds are locked
+                                    _add_amount(amounts, currency, amount, used=amount)
                                     staking_count += 1
+            else:
+                self._unavailable_endpoints.add("staking")
+        except UNAVAILABLE_ERRORS as e:
+            self._unavailable_endpoints.add("staking")
+            logger.debug(f"  OKX staking: {e}")
         except Exception as e:
             logger.debug(f"  OKX staking: {e}")
 
-        # Try ETH 2.0 staking
+        if staking_count > 0:
+            logger.info(f"  OKX staking: {staking_count} positions")
+
+        return amounts
+
+    def _fetch_eth_staking(self) -> Amounts:
+        """Fetch ETH 2.0 staking positions."""
+        amounts = _new_amounts()
+        staking_count = 0
+
         try:
             if hasattr(self.exchange, "privateGetFinanceStakingDefiEthBalance"):
                 eth_staking = self.exchange.privateGetFinanceStakingDefiEthBalance()
@@ -296,31 +467,20 @@ class OKXAdapter(ExchangeAdapter):
                         amount = float(position.get("amt", 0))
 
                         if amount > 0:
-                            if currency not in aggregated:
-                                aggregated[currency] = {"total": 0, "free": 0, "used": 0}
-
-                            aggregated[currency]["total"] += amount
-                            aggregated[currency]["used"] += amount
+                            _add_amount(amounts, currency, amount, used=amount)
                             staking_count += 1
+            else:
+                self._unavailable_endpoints.add("eth_staking")
+        except UNAVAILABLE_ERRORS as e:
+            self._unavailable_endpoints.add("eth_staking")
+            logger.debug(f"  OKX ETH staking: {e}")
         except Exception as e:
             logger.debug(f"  OKX ETH staking: {e}")
 
         if staking_count > 0:
-            logger.info(f"  OKX staking: {staking_count} positions")
+            logger.info(f"  OKX ETH staking: {staking_count} positions")
 
-        # Convert aggregated dict to Balance objects
-        balances = [
-            Balance(
-                currency=currency,
-                total=amounts["total"],
-                free=amounts["free"],
-                used=amounts["used"],
-            )
-            for currency, amounts in aggregated.items()
-        ]
-
-        logger.info(f"OKX total: {len(balances)} currencies across all accounts")
-        return balances
+        return amounts
 
 
 class BitgetAdapter(ExchangeAdapter):
@@ -336,6 +496,8 @@ class BitgetAdapter(ExchangeAdapter):
                 "secret": api_secret,
                 "password": password,
                 "enableRateLimit": True,
+                "session": _shared_session(),
+                "timeout": REQUEST_TIMEOUT_MS,
             }
         )
 
@@ -344,37 +506,37 @@ class BitgetAdapter(ExchangeAdapter):
 
     def fetch_balances(self) -> List[Balance]:
         """Fetch Bitget balances from all account types (spot, margin, swap, earn)."""
-        aggregated = {}  # {currency: {'total': x, 'free': y, 'used': z}}
+        # Account types and Earn products, fetched concurrently
+        fetchers = [
+            lambda account_type=account_type: self._fetch_account(account_type)
+            for account_type in ["spot", "margin", "swap"]
+        ]
+        fetchers.append(self._fetch_earn)
 
-        # Fetch from different account types
-        account_types = ["spot", "margin", "swap"]
-        for account_type in account_types:
-            try:
-                balance_data = self.exchange.fetch_balance({"type": account_type})
+        balances = self._fetch_concurrently(fetchers)
 
-                fetched_count = 0
-                for currency, amounts in balance_data.get("total", {}).items():
-                    if amounts and amounts > 0:
-                        if currency not in aggregated:
-                            aggregated[currency] = {"total": 0, "free": 0, "used": 0}
+        logger.info(f"Bitget total: {len(balances)} currencies across all accounts")
+        return balances
 
-                        aggregated[currency]["total"] += amounts
-                        aggregated[currency]["free"] += balance_data["free"].get(currency, 0)
-                        aggregated[currency]["used"] += balance_data["used"].get(currency, 0)
-                        fetched_count += 1
+    def _fetch_account(self, account_type: str) -> Amounts:
+        """Fetch one account type (spot, margin, swap)."""
+        try:
+            amounts = _account_amounts(self.exchange.fetch_balance(params={"type": account_type}))
 
-                if fetched_count > 0:
-                    logger.info(f"  Bitget {account_type}: {fetched_count} currencies")
+            if amounts:
+                logger.info(f"  Bitget {account_type}: {len(amounts)} currencies")
+            return amounts
 
-            except Exception as e:
-                logger.debug(f"  Bitget {account_type}: Not accessible or empty ({e})")
-                continue
+        except Exception as e:
+            logger.debug(f"  Bitget {account_type}: Not accessible or empty ({e})")
+            return {}
 
-        # Try to fetch from Earn products
+    def _fetch_earn(self) -> Amounts:
+        """Fetch Earn products."""
+        amounts = _new_amounts()
         try:
             # Bitget earn products - try private API
             earn_data = self.exchange.private_get_v2_earn_savings_account()
-            earn_count = 0
 
             if "data" in earn_data and "productList" in earn_data["data"]:
                 for product in earn_data["data"]["productList"]:
@@ -382,37 +544,20 @@ class BitgetAdapter(ExchangeAdapter):
                     amount = float(product.get("amount", 0))
 
                     if amount > 0:
-                        if currency not in aggregated:
-                            aggregated[currency] = {"total": 0, "free": 0, "used": 0}
-
-                        aggregated[currency]["total"] += amount
                         # Check if it's flexible or locked
                         product_type = product.get("productType", "")
                         if "flexible" in product_type.lower():
-                            aggregated[currency]["free"] += amount
+                            _add_amount(amounts, currency, amount, free=amount)
                         else:
-                            aggregated[currency]["used"] += amount
-                        earn_count += 1
+                            _add_amount(amounts, currency, amount, used=amount)
 
-            if earn_count > 0:
-                logger.info(f"  Bitget earn: {earn_count} currencies")
+            if amounts:
+                logger.info(f"  Bitget earn: {len(amounts)} currencies")
 
         except Exception as e:
             logger.debug(f"  Bitget earn: Not accessible ({e})")
 
-        # Convert aggregated dict to Balance objects
-        balances = [
-            Balance(
-                currency=currency,
-                total=amounts["total"],
-                free=amounts["free"],
-                used=amounts["used"],
-            )
-            for currency, amounts in aggregated.items()
-        ]
-
-        logger.info(f"Bitget total: {len(balances)} currencies across all accounts")
-        return balances
+        return amounts
 
 
 def create_exchange(
@@ -6,20 +6,28 @@ Fetches current prices from TradingView for all currencies with TradingView symb
 Updates the fx_rates table with the latest prices.
 
 Requirements:
-    pip install --upgrade --no-cache tradingview-scraper
+    pip install requests
 
 Usage:
     from portfolio.tradingview import fetch_and_update_prices
 
-    updated_count = fetch_and_update_prices('portfolio.db')
-    print(f"Updated {updated_count} prices")
+    result = fetch_and_update_prices('portfolio.db')
+    print(f"Updated {result.total_updated} prices, {len(result.failed)} failed")
 """
 
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, List, Tuple
+from functools import lru_cache
+from typing import Optional, Dict, Iterator, List, Tuple
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,6 +35,73 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Concurrent TradingView requests (kept low to stay within rate limits)
+MAX_FETCH_WORKERS = 8
+
+# Rates updated more recently than this are not fetched again
+DEFAULT_TTL_HOURS = 1
+
+# Retries for rate-limited (429), 5xx and dropped TradingView requests.
+# Backoff doubles from 1s up to 30s with up to 1s of jitter; a Retry-After
+# header takes precedence over the computed delay
+FETCH_RETRY = Retry(
+    total=3,
+    backoff_factor=1,
+    backoff_max=30,
+    backoff_jitter=1.0,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# TradingView's symbol scanner endpoint. It takes the symbol and a
+# comma-separated list of fields and answers with a flat JSON object
+SCANNER_URL = "https://scanner.tradingview.com/symbol"
+
+# The scanner rejects requests without a browser-like User-Agent
+SCANNER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+}
+
+def _open(db_path: str) -> sqlite3.Connection:
+    """
+    Open a connection with WAL and tuned PRAGMAs applied.
+
+    WAL keeps readers from blocking the rate writes, and synchronous=NORMAL
+    drops an fsync per commit while staying crash-safe.
+    """
+    # The same few statements run on every connection; keep them prepared
+    conn = sqlite3.connect(db_path, cached_statements=128)
+    conn.executescript("""
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        PRAGMA temp_store = MEMORY;
+        PRAGMA cache_size = -20000;
+        PRAGMA mmap_size = 268435456;
+        PRAGMA foreign_keys = ON;
+    """)
+    return conn
+
+
+@contextmanager
+def _write_tx(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run the block as one BEGIN IMMEDIATE transaction.
+
+    The write lock is taken up front, so the block can't fail halfway on
+    lock upgrade. Commits on success and rolls back if the block raises.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
 
 def get_tradingview_symbols(db_path: str) -> List[Tuple[int, str, str, bool]]:
     """
@@ -41,25 +116,45 @@ def get_tradingview_symbols(db_path: str) -> List[Tuple[int, str, str, bool]]:
     Returns:
         List of (currency_id, currency_code, tradingview_symbol, is_inverted) tuples
     """
-    conn = sqlite3.connect(db_path)
+    conn = _open(db_path)
     try:
-        cursor = conn.execute("""
-            SELECT
-                c.id,
-                c.code,
-                sm.symbol,
-                sm.is_inverted
-            FROM currencies c
-            INNER JOIN symbol_mappings sm ON c.id = sm.currency_id
-            WHERE sm.source = 'tradingview'
-              AND (c.parent_currency_id IS NULL OR c.parent_currency_id = c.id)
-            ORDER BY c.code
-        """)
-        return cursor.fetchall()
+        return list(_tradingview_symbols(conn))
     finally:
         conn.close()
 
 
+def _tradingview_symbols(conn: sqlite3.Connection) -> Iterator[Tuple[int, str, str, bool]]:
+    """get_tradingview_symbols() on an open connection."""
+    cursor = conn.execute("""
+        SELECT
+            c.id,
+            c.code,
+            sm.symbol,
+            sm.is_inverted
+        FROM currencies c
+        INNER JOIN symbol_mappings sm ON c.id = sm.currency_id
+        WHERE sm.source = 'tradingview'
+          AND (c.parent_currency_id IS NULL OR c.parent_currency_id = c.id)
+        ORDER BY c.code
+    """)
+    return cursor
+
+
+@lru_cache(maxsize=None)
+def _session() -> requests.Session:
+    """
+    Return the keep-alive session shared by the fetch threads.
+
+    A pooled session reuses connections (DNS, TCP, TLS) across symbols
+    instead of opening a new one per request, and retries transient
+    failures (FETCH_RETRY).
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=FETCH_RETRY)
+    session.mount("https://", adapter)
+    return session
+
+
 def fetch_price_from_tradingview(symbol: str) -> Optional[float]:
     """
     Fetch current price from TradingView for a given symbol.
@@ -71,24 +166,62 @@ def fetch_price_from_tradingview(symbol: str) -> Optional[float]:
         Current price as float, or None if fetch fails
     """
     try:
-        from tradingview_scraper.symbols.overview import Overview
-
-        ov = Overview()
-        data = ov.get_symbol_overview(symbol)
-
-        if data and 'data' in data and 'close' in data['data']:
-            price = data['data']['close']
-            logger.info(f"Fetched {symbol}: {price}")
-            return float(price)
-        else:
-            logger.warning(f"No price data for {symbol}")
+        # Only the close is used; asking for it alone keeps responses small
+        response = _session().get(
+            SCANNER_URL,
+            params={'symbol': symbol.strip().upper(), 'fields': 'close'},
+            headers=SCANNER_HEADERS,
+            timeout=10,
+        )
+
+        try:
+            response.raise_for_status()
+            price = float(response.json()['close'])
+        except (requests.HTTPError, KeyError, TypeError, ValueError):
+            # Error statuses, an empty body and a missing or null close all land here
+            logger.warning("No price data for %s", symbol)
             return None
 
+        logger.debug("Fetched %s: %s", symbol, price)
+        return price
+
     except Exception as e:
-        logger.error(f"Error fetching {symbol}: {e}")
+        logger.error("Error fetching %s: %s", symbol, e)
         return None
 
 
+# Insert a rate, or overwrite the existing one for that currency
+UPSERT_FX_RATE_SQL = """
+    INSERT INTO fx_rates (currency_id, rate, source, updated_at)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(currency_id) DO UPDATE SET
+        rate = excluded.rate,
+        source = excluded.source,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+def update_fx_rates_bulk(
+    conn: sqlite3.Connection,
+    rows: List[Tuple[int, float, str]]
+) -> int:
+    """
+    Update or insert FX rates for many currencies with one statement.
+
+    The UPSERT is prepared once and only rebound per row, and the caller
+    owns the transaction, so a whole batch costs one commit.
+
+    Args:
+        conn: Open database connection
+        rows: (currency_id, rate, source) tuples
+
+    Returns:
+        Number of rows written
+    """
+    conn.executemany(UPSERT_FX_RATE_SQL, rows)
+    return len(rows)
+
+
 def update_fx_rate(
     db_path: str,
     currency_id: int,
@@ -107,21 +240,10 @@ def update_fx_rate(
     Returns:
         True if successful, False otherwise
     """
-    conn = sqlite3.connect(db_path)
+    conn = _open(db_path)
     try:
-        conn.execute("PRAGMA foreign_keys = ON")
-
-        # Use INSERT OR REPLACE to handle both new and existing rates
-        conn.execute("""
-            INSERT INTO fx_rates (currency_id, rate, source, updated_at)
-            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(currency_id) DO UPDATE SET
-                rate = excluded.rate,
-                source = excluded.source,
-                updated_at = CURRENT_TIMESTAMP
-        """, (currency_id, rate, source))
-
-        conn.commit()
+        with conn:
+            update_fx_rates_bulk(conn, [(currency_id, rate, source)])
         return True
 
     except sqlite3.Error as e:
@@ -144,53 +266,10 @@ def propagate_parent_rates(db_path: str) -> int:
     Returns:
         Number of child currencies updated
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
+    conn = _open(db_path)
     try:
-        # Get all child currencies with their parent rates
-        cursor = conn.execute("""
-            SELECT
-                child.id as child_id,
-                child.code as child_code,
-                parent.id as parent_id,
-                parent.code as parent_code,
-                fx.rate as parent_rate,
-                fx.source as parent_source
-            FROM currencies child
-            INNER JOIN currencies parent ON child.parent_currency_id = parent.id
-            INNER JOIN fx_rates fx ON parent.id = fx.currency_id
-            WHERE child.parent_currency_id IS NOT NULL
-              AND child.id != child.parent_currency_id
-        """)
-
-        children = cursor.fetchall()
-
-        if not children:
-            logger.info("No child currencies with parent rates found")
-            return 0
-
-        logger.info(f"Propagating rates to {len(children)} child currencies...")
-
-        updated_count = 0
-        for child in children:
-            # Update child currency with parent's rate
-            conn.execute("""
-                INSERT INTO fx_rates (currency_id, rate, source, updated_at)
-                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                ON CONFLICT(currency_id) DO UPDATE SET
-                    rate = excluded.rate,
-                    source = excluded.source,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (child['child_id'], child['parent_rate'],
-                  f"{child['parent_source']} (from {child['parent_code']})"))
-
-            logger.info(f"  ✓ {child['child_code']} ← {child['parent_code']}: ${child['parent_rate']}")
-            updated_count += 1
-
-        conn.commit()
-        return updated_count
-
+        with _write_tx(conn):
+            return _propagate_parent_rates(conn)
     except sqlite3.Error as e:
         logger.error(f"Error propagating parent rates: {e}")
         return 0
@@ -198,70 +277,204 @@ def propagate_parent_rates(db_path: str) -> int:
         conn.close()
 
 
-def fetch_and_update_prices(db_path: str = 'portfolio.db') -> int:
+def _propagate_parent_rates(conn: sqlite3.Connection) -> int:
+    """
+    propagate_parent_rates() on an open connection.
+
+    Runs inside the caller's transaction and lets sqlite3.Error propagate,
+    so the caller decides what else commits or rolls back with it.
+    """
+    # Copy every child's parent rate in one set-based upsert
+    cursor = conn.execute("""
+        INSERT INTO fx_rates (currency_id, rate, source, updated_at)
+        SELECT
+            child.id,
+            fx.rate,
+            fx.source || ' (from ' || parent.code || ')',
+            CURRENT_TIMESTAMP
+        FROM currencies child
+        INNER JOIN currencies parent ON child.parent_currency_id = parent.id
+        INNER JOIN fx_rates fx ON parent.id = fx.currency_id
+        WHERE child.parent_currency_id IS NOT NULL
+          AND child.id != child.parent_currency_id
+        ON CONFLICT(currency_id) DO UPDATE SET
+            rate = excluded.rate,
+            source = excluded.source,
+            updated_at = CURRENT_TIMESTAMP
+    """)
+    updated_count = cursor.rowcount
+
+    if not updated_count:
+        logger.info("No child currencies with parent rates found")
+        return 0
+
+    logger.info(f"Propagated rates to {updated_count} child currencies")
+    return updated_count
+
+
+@dataclass(slots=True)
+class FetchResult:
+    """Outcome of one fetch_and_update_prices() run."""
+
+    updated: List[str] = field(default_factory=list)  # Parent currency codes written
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (currency code, reason)
+    skipped: List[str] = field(default_factory=list)  # Codes still fresh within the TTL
+    child_count: int = 0  # Child currencies that inherited a parent rate
+
+    @property
+    def total_updated(self) -> int:
+        """Parent and child rates written, the count this function used to return."""
+        return len(self.updated) + self.child_count
+
+
+def fetch_and_update_prices(
+    db_path: str = 'portfolio.db',
+    max_workers: int = MAX_FETCH_WORKERS,
+    ttl_hours: float = DEFAULT_TTL_HOURS
+) -> FetchResult:
     """
     Fetch prices from TradingView and update fx_rates table.
     Also propagates rates from parent currencies to child currencies.
 
+    Currencies whose rate is younger than ttl_hours are skipped, so re-runs
+    don't spend TradingView requests on prices that were just fetched.
+
     Args:
         db_path: Path to the SQLite database
+        max_workers: Most TradingView requests in flight at once
+        ttl_hours: Skip rates updated within this many hours (0 fetches all)
 
     Returns:
-        Number of successfully updated prices (including propagated child rates)
+        FetchResult with the updated, failed and skipped currency codes and the
+        number of child currencies updated
     """
-    logger.info("Starting TradingView price fetch...")
-
-    # Get all TradingView symbols (excludes child currencies with parents)
-    symbols = get_tradingview_symbols(db_path)
-
-    if not symbols:
-        logger.warning("No TradingView symbol mappings found in database")
-        return 0
-
-    logger.info(f"Found {len(symbols)} parent currencies with TradingView mappings")
-
-    # Fetch and update prices
-    updated_count = 0
-    failed_symbols = []
-
-    for currency_id, currency_code, tv_symbol, is_inverted in symbols:
-        logger.info(f"Processing {currency_code} ({tv_symbol})...")
+    # One connection for every phase, so they share its page cache
+    conn = _open(db_path)
+    try:
+        return _fetch_and_update_prices(conn, max_workers, ttl_hours)
+    finally:
+        conn.close()
 
-        price = fetch_price_from_tradingview(tv_symbol)
 
-        if price is not None:
-            # Apply inversion if needed
-            if is_inverted:
-                rate = 1.0 / price if price != 0 else 0
-                logger.info(f"Inverted {tv_symbol}: {price} → {rate:.8f}")
-            else:
-                rate = price
+def _fetch_and_update_prices(
+    conn: sqlite3.Connection,
+    max_workers: int,
+    ttl_hours: float
+) -> FetchResult:
+    """fetch_and_update_prices() on an open connection."""
+    logger.info("Starting TradingView price fetch...")
 
-            if update_fx_rate(db_path, currency_id, rate):
-                updated_count += 1
-                logger.info(f"✓ Updated {currency_code}: ${rate}")
-            else:
-                failed_symbols.append((currency_code, "Database error"))
+    # Currencies whose rate is still within the TTL are left out
+    fresh = set()
+    if ttl_hours > 0:
+        fresh = {
+            currency_id for currency_id, in conn.execute(
+                "SELECT currency_id FROM fx_rates WHERE updated_at > datetime('now', ?)",
+                (f"-{ttl_hours} hours",)
+            )
+        }
+
+    # Get all TradingView symbols (excludes child currencies with parents),
+    # splitting off the fresh ones as the rows stream off the cursor
+    symbols = []
+    skipped = []
+    for row in _tradingview_symbols(conn):
+        if row[0] in fresh:
+            skipped.append(row[1])
         else:
-            failed_symbols.append((currency_code, "Fetch failed"))
+            symbols.append(row)
+    total_symbols = len(symbols) + len(skipped)
 
-    # Propagate parent rates to child currencies
+    if not total_symbols:
+        logger.warning("No TradingView symbol mappings found in database")
+        return FetchResult()
+
+    logger.info(f"Found {total_symbols} parent currencies with TradingView mappings")
+    if skipped:
+        logger.info(
+            f"Skipping {len(skipped)} rates updated within {ttl_hours}h: {', '.join(skipped)}"
+        )
+
+    # Each fetch is a blocking HTTP request; run them side by side and keep
+    # the results in symbol order
+    prices = []
+    if logger.isEnabledFor(logging.DEBUG):
+        for _, currency_code, tv_symbol, _ in symbols:
+            logger.debug("Processing %s (%s)...", currency_code, tv_symbol)
+    if symbols:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as pool:
+            prices = list(pool.map(fetch_price_from_tradingview, [row[2] for row in symbols]))
+
+    # Collect the rates to write in one transaction, inverting where the
+    # mapping quotes the pair the other way round (a zero price stays zero)
+    results = list(zip(symbols, prices))
+    rows = [
+        (currency_id, 1.0 / price if is_inverted and price else price, 'tradingview')
+        for (currency_id, _, _, is_inverted), price in results
+        if price is not None
+    ]
+    failed_symbols = [
+        (currency_code, "Fetch failed")
+        for (_, currency_code, _, _), price in results
+        if price is None
+    ]
+    if logger.isEnabledFor(logging.DEBUG):
+        inverted = [
+            f"{tv_symbol}: {price} → {1.0 / price if price else 0:.8f}"
+            for (_, _, tv_symbol, is_inverted), price in results
+            if is_inverted and price is not None
+        ]
+        if inverted:
+            logger.debug("Inverted %d rates: %s", len(inverted), ", ".join(inverted))
+
+    # Write the parent rates and propagate them to child currencies in one
+    # transaction, so children never lag behind a committed parent rate
+    child_count = 0
+    updated = []
     logger.info("=" * 60)
-    child_count = propagate_parent_rates(db_path)
-    total_updated = updated_count + child_count
+    try:
+        with _write_tx(conn):
+            update_fx_rates_bulk(conn, rows)
+            child_count = _propagate_parent_rates(conn)
+        codes = {currency_id: currency_code for currency_id, currency_code, _, _ in symbols}
+        updated = [codes[currency_id] for currency_id, _, _ in rows]
+        if logger.isEnabledFor(logging.DEBUG):
+            for (_, rate, _), currency_code in zip(rows, updated):
+                logger.debug("✓ Updated %s: $%s", currency_code, rate)
 
-    # Summary
-    logger.info("=" * 60)
-    logger.info(f"Price fetch complete: {updated_count}/{len(symbols)} parent currencies")
-    logger.info(f"Child currencies updated: {child_count}")
-    logger.info(f"Total updated: {total_updated}")
+    except sqlite3.Error as e:
+        logger.error(f"Database error updating fx rates: {e}")
+        # The batch rolled back, so none of the fetched rates were saved
+        child_count = 0
+        fetched = {currency_id for currency_id, _, _ in rows}
+        failed_symbols.extend(
+            (currency_code, "Database error")
+            for currency_id, currency_code, _, _ in symbols
+            if currency_id in fetched
+        )
+
+    result = FetchResult(updated, failed_symbols, skipped, child_count)
+
+    # Refresh planner statistics after the bulk writes (only re-analyzes
+    # tables whose stats have drifted, so it's cheap on most runs)
+    conn.execute("PRAGMA optimize")
+
+    # Summary, emitted as one record per level rather than one per line
+    logger.info("\n".join([
+        "=" * 60,
+        f"Price fetch complete: {len(updated)}/{len(symbols)} parent currencies"
+        f" ({total_symbols - len(symbols)} still fresh)",
+        f"Child currencies updated: {child_count}",
+        f"Total updated: {result.total_updated}",
+    ]))
 
     if failed_symbols:
-        logger.warning("Failed to update:")
-        for symbol, reason in failed_symbols:
-            logger.warning(f"  • {symbol}: {reason}")
+        logger.warning("\n".join(
+            ["Failed to update:"]
+            + [f"  • {symbol}: {reason}" for symbol, reason in failed_symbols]
+        ))
 
-    return total_updated
+    return result
 
 
 def check_stale_rates(db_path: str = 'portfolio.db', hours: int = 24) -> List[Dict]:
@@ -275,50 +488,68 @@ def check_stale_rates(db_path: str = 'portfolio.db', hours: int = 24) -> List[Di
     Returns:
         List of stale rate dictionaries
     """
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-
+    conn = _open(db_path)
     try:
-        cursor = conn.execute("""
-            SELECT
-                c.code as currency_code,
-                fx.rate,
-                fx.source,
-                fx.updated_at,
-                ROUND((julianday('now') - julianday(fx.updated_at)) * 24, 1) as hours_old
-            FROM fx_rates fx
-            INNER JOIN currencies c ON fx.currency_id = c.id
-            WHERE (julianday('now') - julianday(fx.updated_at)) * 24 > ?
-            ORDER BY fx.updated_at ASC
-        """, (hours,))
-
-        return [dict(row) for row in cursor.fetchall()]
-
+        return _stale_rates(conn, hours)
     finally:
         conn.close()
 
 
+def _stale_rates(conn: sqlite3.Connection, hours: int) -> List[Dict]:
+    """check_stale_rates() on an open connection."""
+    cursor = conn.execute("""
+        SELECT
+            c.code as currency_code,
+            fx.rate,
+            fx.source,
+            fx.updated_at,
+            ROUND((julianday('now') - julianday(fx.updated_at)) * 24, 1) as hours_old
+        FROM fx_rates fx
+        INNER JOIN currencies c ON fx.currency_id = c.id
+        WHERE fx.updated_at < datetime('now', ?)
+        ORDER BY fx.updated_at ASC
+    """, (f"-{hours} hours",))
+
+    # Unpack the plain tuples straight off the cursor rather than going
+    # through sqlite3.Row and a fetchall() buffer
+    return [
+        {
+            'currency_code': currency_code,
+            'rate': rate,
+            'source': source,
+            'updated_at': updated_at,
+            'hours_old': hours_old,
+        }
+        for currency_code, rate, source, updated_at, hours_old in cursor
+    ]
+
+
 def main():
     """Main entry point for command-line usage."""
     import sys
 
-    db_path = sys.argv[1] if len(sys.argv) > 1 else 'portfolio.db'
+    args = [arg for arg in sys.argv[1:] if arg != '--force']
+    db_path = args[0] if args else 'portfolio.db'
 
-    # Fetch and update prices
-    updated_count = fetch_and_update_prices(db_path)
+    # Fetch and update prices (--force refetches rates that are still fresh)
+    ttl_hours = 0 if '--force' in sys.argv[1:] else DEFAULT_TTL_HOURS
+    result = fetch_and_update_prices(db_path, ttl_hours=ttl_hours)
 
     # Check for stale rates
     stale = check_stale_rates(db_path)
 
     if stale:
-        logger.warning(f"\n⚠️  Found {len(stale)} stale rates (>24h old):")
-        for rate in stale:
-            logger.warning(
+        logger.warning("\n".join(
+            [f"\n⚠️  Found {len(stale)} stale rates (>24h old):"]
+            + [
                 f"  • {rate['currency_code']}: "
                 f"{rate['hours_old']:.1f}h old (last: {rate['updated_at']})"
-            )
+                for rate in stale
+            ]
+        ))
 
-    sys.exit(0 if updated_count > 0 else 1)
+    # Rates skipped as still fresh are fine; any failed symbol fails the run
+    sys.exit(1 if result.failed else 0)
 
 
 if __name__ == "__main__":